@@ -1,7 +1,13 @@
+import csv
 import io
+import os
 import re
+import sys
+from operator import attrgetter
 from pathlib import Path
 
+import numpy as np
+import openpyxl
 import pandas as pd
 import streamlit as st
 
@@ -12,26 +18,78 @@ from logic.lectura import (
     detectar_columnas,
     detectar_encabezado,
     normalizar_columna_descripcion,
+    parsear_fechas,
 )
 from logic.conciliacion import conciliar, Parametros
-from logic.modelos import Movimiento
-from infra.loader_bancos import cargar_banco
+from logic.modelos import ESTADOS, Match, Movimiento, Origen
+from infra.loader_bancos import _BYTES_MUESTRA, _detectar_encoding, _encodings_a_probar, cargar_banco
 
 # =========================
 # Helper para CSV
 # =========================
+_SEPARADORES_CSV = ";,\t|"
+_FILAS_ENCABEZADO = 10  # filas iniciales donde se busca el encabezado de un Excel
+# pandas solo acepta el separador regex como str (el engine python lo compila una vez por lectura)
+_SEP_ESPACIOS = r"\s{2,}"
+
+# "1,234.56" -> "1.234,56"
+_SEPARADORES_AR = str.maketrans({",": ".", ".": ","})
+
+
+def _formatear_importe(valor: float) -> str:
+    return f"{valor:,.2f}".translate(_SEPARADORES_AR)
+
+
 def leer_csv_seguro(file):
-    """Intenta leer un CSV probando encodings y separadores comunes."""
-    for enc in ["latin1", "utf-8", "cp1252"]:
-        for sep in [";", ",", "\t", r"\s{2,}"]:
+    """Lee un CSV detectando encoding y separador sobre una muestra inicial y parseando una sola vez.
+
+    El encoding de la muestra (el mismo detector que usa el loader de bancos) es la primera
+    opción: si un byte posterior no decodifica se reintenta con cp1252 y latin1 (nunca falla).
+    """
+    primero = _detectar_encoding(file)
+    file.seek(0)
+    muestra = file.read(_BYTES_MUESTRA)
+    for enc in _encodings_a_probar(primero):
+        try:
+            df = _leer_csv_con_encoding(file, muestra, enc)
+        except UnicodeDecodeError:
+            continue
+        if df is not None:
+            return df
+    raise ValueError(f"❌ No se pudo leer {file.name} con encoding/separador común.")
+
+
+def _leer_csv_con_encoding(file, muestra: bytes, enc: str) -> pd.DataFrame | None:
+    """Parsea con un encoding fijo; None si ningún separador da más de una columna."""
+    try:
+        sep = csv.Sniffer().sniff(muestra.decode(enc, errors="replace"), delimiters=_SEPARADORES_CSV).delimiter
+    except csv.Error:
+        sep = None
+
+    if sep:
+        for engine in ("pyarrow", "c"):
             try:
-                file.seek(0)  # reiniciar puntero
-                df = pd.read_csv(file, encoding=enc, sep=sep, engine="python")
-                if df.shape[1] > 1:
-                    return df
+                file.seek(0)
+                df = pd.read_csv(file, encoding=enc, sep=sep, engine=engine)
+            except UnicodeDecodeError:
+                raise
             except Exception:
                 continue
-    raise ValueError(f"❌ No se pudo leer {file.name} con encoding/separador común.")
+            if df.shape[1] > 1:
+                return df
+            break
+
+    # Último recurso: columnas alineadas con espacios
+    try:
+        file.seek(0)
+        df = pd.read_csv(file, encoding=enc, sep=_SEP_ESPACIOS, engine="python")
+        if df.shape[1] > 1:
+            return df
+    except UnicodeDecodeError:
+        raise
+    except Exception:
+        pass
+    return None
 
 
 def leer_csv_banco(file):
@@ -52,6 +110,212 @@ def leer_csv_banco(file):
             pass
         return leer_csv_seguro(file)
 
+
+def _nombres_columnas(encabezado: tuple) -> list:
+    """Nombres de columna como los arma pd.read_excel: vacíos -> 'Unnamed: k', repetidos -> 'x.1', 'x.2'..."""
+    nombres, vistos = [], {}
+    for k, valor in enumerate(encabezado):
+        nombre = f"Unnamed: {k}" if valor is None else valor
+        if nombre in vistos:
+            vistos[nombre] += 1
+            nombre = f"{nombre}.{vistos[nombre]}"
+        else:
+            vistos[nombre] = 0
+        nombres.append(nombre)
+    return nombres
+
+
+def _df_desde_hoja(ws) -> pd.DataFrame:
+    """Arma el DataFrame de una hoja abierta en modo read_only, leyendo sus filas una sola vez.
+
+    El encabezado se detecta sobre las filas ya leídas y el resto pasa directo al
+    constructor de DataFrame (sin reparsear el archivo).
+    """
+    ws.reset_dimensions()  # la dimensión declarada en el xlsx no siempre es confiable
+    filas = list(ws.iter_rows(values_only=True))
+
+    # Igual que pd.read_excel: descartar filas vacías al final y emparejar el ancho
+    while filas and all(v is None for v in filas[-1]):
+        filas.pop()
+    if not filas:
+        return pd.DataFrame()
+    ancho = max(len(f) for f in filas)
+    filas = [f + (None,) * (ancho - len(f)) if len(f) < ancho else f for f in filas]
+
+    header_row = detectar_encabezado(pd.DataFrame(filas[:_FILAS_ENCABEZADO]), tope=_FILAS_ENCABEZADO)
+    return pd.DataFrame(filas[header_row + 1:], columns=_nombres_columnas(filas[header_row]))
+
+
+@st.cache_data(show_spinner=False)
+def leer_excel(contenido: bytes, hoja: str | None = None) -> tuple[list[str], pd.DataFrame | None]:
+    """Abre el Excel una sola vez (openpyxl read_only) y devuelve (hojas, df).
+
+    - Con `hoja`: lee esa hoja.
+    - Sin `hoja` y con una única hoja: la lee en la misma apertura.
+    - Sin `hoja` y con varias hojas: df es None (hay que elegir la hoja).
+    """
+    wb = openpyxl.load_workbook(io.BytesIO(contenido), read_only=True, data_only=True)
+    try:
+        hojas = wb.sheetnames
+        if hoja is None:
+            if len(hojas) != 1:
+                return hojas, None
+            hoja = hojas[0]
+        return hojas, _df_desde_hoja(wb[hoja])
+    finally:
+        wb.close()
+
+
+@st.cache_data(show_spinner=False)
+def leer_archivo(nombre: str, contenido: bytes) -> pd.DataFrame:
+    """Lee un CSV subido, cacheado por nombre y contenido.
+
+    Evita volver a parsear los archivos en cada rerun de Streamlit (cambio de widget, filtro, etc.).
+    """
+    buffer = io.BytesIO(contenido)
+    buffer.name = nombre
+    return leer_csv_banco(buffer)
+
+
+def cargar_subidos(archivos, origen: Origen) -> list[pd.DataFrame]:
+    """Lee los archivos subidos de un origen; pide la hoja solo si un Excel tiene varias.
+
+    Las lecturas se guardan en `st.session_state` por (file_id, hoja): en los reruns con los
+    mismos archivos no se vuelve a hashear el contenido para consultar `st.cache_data`.
+    """
+    previas = st.session_state.get(f"_lecturas_{origen}", {})
+    ids = {f.file_id for f in archivos}
+    lecturas = {clave: v for clave, v in previas.items() if clave[0] in ids}
+    st.session_state[f"_lecturas_{origen}"] = lecturas
+
+    def leer(f, hoja=None):
+        clave = (f.file_id, hoja)
+        if clave not in lecturas:
+            if f.name.lower().endswith((".xlsx", ".xlsm")):
+                lecturas[clave] = leer_excel(f.getvalue(), hoja)
+            else:
+                lecturas[clave] = ([], leer_archivo(f.name, f.getvalue()))
+        return lecturas[clave]
+
+    dfs = []
+    for f in archivos:
+        hojas, df = leer(f)
+        if df is None:
+            hoja = st.selectbox(
+                f"{origen}: seleccione hoja de {f.name}",
+                hojas,
+                key=f"{origen}_{f.name}"
+            )
+            _, df = leer(f, hoja)
+        dfs.append(df)
+    return dfs
+
+
+def unir_dataframes(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena los archivos subidos evitando la alineación de columnas de pd.concat.
+
+    - Un solo archivo: se devuelve tal cual (con índice reiniciado).
+    - Mismas columnas: concat directo, sin reindexar.
+    - Columnas distintas: se reindexa cada frame a la unión (en orden de aparición) antes de concatenar.
+    """
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    primeras = frames[0].columns
+    if not all(df.columns.equals(primeras) for df in frames[1:]):
+        cols = list(dict.fromkeys(c for df in frames for c in df.columns))
+        frames = [df.reindex(columns=cols) for df in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def columnas_usadas(*columnas: str | None) -> list[str]:
+    """Columnas elegidas en el mapeo, sin None ni repetidas (en el orden dado)."""
+    return list(dict.fromkeys(c for c in columnas if c is not None))
+
+
+def construir_movimientos(df: pd.DataFrame, col_fecha: str, col_desc: str, origen: Origen) -> list[Movimiento]:
+    """Convierte filas con fecha e importe_final válidos (distinto de 0) en Movimientos.
+
+    El filtrado y las conversiones se hacen por columna; el único bucle Python es la construcción.
+    Las descripciones repetidas se internan para compartir una sola instancia.
+    """
+    fechas = pd.to_datetime(df[col_fecha], errors="coerce")
+    importes = pd.to_numeric(df["importe_final"], errors="coerce")
+    mask = fechas.notna() & importes.notna() & (importes != 0)
+    return [
+        Movimiento(f, imp, sys.intern(str(desc)), origen)
+        for f, imp, desc in zip(
+            fechas[mask].dt.date.to_numpy(),
+            importes[mask].to_numpy(dtype=float).tolist(),
+            df.loc[mask, col_desc].astype(str).to_numpy(),
+        )
+    ]
+
+_COLUMNAS_SALIDA = (
+    "fecha_banco", "importe_banco", "desc_banco",
+    "fecha_interno", "importe_interno", "desc_interno",
+    "estado", "correccion_sugerida",
+)
+_campos_match = attrgetter(*_COLUMNAS_SALIDA)
+
+
+def construir_salida(matches: list[Match], pend_b: list[Movimiento], pend_i: list[Movimiento]) -> pd.DataFrame:
+    """Arma la tabla de salida columna por columna: matches, luego pendientes de Banco y de Interno."""
+    columnas = zip(*map(_campos_match, matches)) if matches else ([] for _ in _COLUMNAS_SALIDA)
+    datos = {nombre: list(valores) for nombre, valores in zip(_COLUMNAS_SALIDA, columnas)}
+    n_b, n_i = len(pend_b), len(pend_i)
+
+    datos["fecha_banco"] += [m.fecha for m in pend_b] + [pd.NaT] * n_i
+    datos["importe_banco"] += [m.importe for m in pend_b] + [pd.NA] * n_i
+    datos["desc_banco"] += [m.descripcion for m in pend_b] + [""] * n_i
+    datos["fecha_interno"] += [pd.NaT] * n_b + [m.fecha for m in pend_i]
+    datos["importe_interno"] += [pd.NA] * n_b + [m.importe for m in pend_i]
+    datos["desc_interno"] += [""] * n_b + [m.descripcion for m in pend_i]
+    datos["estado"] += ["No conciliado (solo Banco)"] * n_b + ["No conciliado (solo Interno)"] * n_i
+    datos["correccion_sugerida"] += ["Cargar en Interno / revisar"] * n_b + ["Cargar en Banco / revisar"] * n_i
+
+    # Fechas como datetime64: la exportación a Excel solo formatea columnas de ese tipo
+    for col in ("fecha_banco", "fecha_interno"):
+        datos[col] = pd.to_datetime(datos[col])
+
+    # estado como categórica: filtros y conteos operan sobre códigos enteros
+    extras = sorted(set(datos["estado"]).difference(ESTADOS))
+    datos["estado"] = pd.Categorical(datos["estado"], categories=[*ESTADOS, *extras])
+    return pd.DataFrame(datos)
+
+
+def formatear_df_ui(df: pd.DataFrame) -> pd.DataFrame:
+    """Devuelve una copia con fechas (DD/MM/AAAA) e importes (1.234,56) ya convertidos a texto."""
+    out = df.copy()
+    for col in ["fecha_banco", "fecha_interno"]:
+        if col in out.columns:
+            out[col] = pd.to_datetime(out[col], errors="coerce").dt.strftime("%d/%m/%Y").fillna("")
+    for col in ["importe_banco", "importe_interno"]:
+        if col in out.columns:
+            importes = pd.to_numeric(out[col], errors="coerce")
+            # El cambio de separadores va dentro de la función: con la columna vacía o toda NaN
+            # el resultado de map sigue siendo float y no admite .str
+            out[col] = importes.map(_formatear_importe, na_action="ignore").fillna("")
+    return out
+
+
+# Clasificación de estados en pilares (por prefijo)
+_PILARES = (
+    ("Conciliado", "Conciliados"),
+    ("Sugerido", "Sugeridos"),
+    ("No conciliado", "No conciliados"),
+)
+
+
+def clasificar_estados(estados: pd.Series) -> np.ndarray:
+    """Pilar de cada estado, resuelto en bloque con np.select ("Otros" si no coincide ningún prefijo)."""
+    texto = estados.astype(str)
+    return np.select(
+        [texto.str.startswith(prefijo).to_numpy(dtype=bool) for prefijo, _ in _PILARES],
+        [pilar for _, pilar in _PILARES],
+        default="Otros",
+    )
+
+
 # =========================
 # Configuración inicial
 # =========================
@@ -116,55 +380,17 @@ with col_up2:
 if archivos_banco and archivos_interno:
 
     # ---- Leer archivos como DataFrames ----
-    dfs_banco, dfs_interno = [], []
-
     colB, colI = st.columns(2)
     # ----- Banco -----
     with colB:
-        for f in archivos_banco:
-            if f.name.lower().endswith((".xlsx", ".xlsm")):
-                xls = pd.ExcelFile(f, engine="openpyxl")
-                if len(xls.sheet_names) == 1:
-                    hoja_b = xls.sheet_names[0]
-                else:
-                    hoja_b = st.selectbox(
-                        f"Banco: seleccione hoja de {f.name}",
-                        xls.sheet_names,
-                        key=f"Banco_{f.name}"
-                    )
-                tmp = pd.read_excel(f, sheet_name=hoja_b, header=None)
-                header_row = detectar_encabezado(tmp)
-                df_b = pd.read_excel(f, sheet_name=hoja_b, header=header_row)
-            else:
-                buffer = io.BytesIO(f.getvalue())
-                buffer.name = f.name
-                df_b = leer_csv_banco(buffer)
-            dfs_banco.append(df_b)
+        dfs_banco = cargar_subidos(archivos_banco, "Banco")
 
     # ----- Interno -----
     with colI:
-        for f in archivos_interno:
-            if f.name.lower().endswith((".xlsx", ".xlsm")):
-                xls = pd.ExcelFile(f, engine="openpyxl")
-                if len(xls.sheet_names) == 1:
-                    hoja_i = xls.sheet_names[0]
-                else:
-                    hoja_i = st.selectbox(
-                        f"Interno: seleccione hoja de {f.name}",
-                        xls.sheet_names,
-                        key=f"Interno_{f.name}"
-                    )
-                tmp = pd.read_excel(f, sheet_name=hoja_i, header=None)
-                header_row = detectar_encabezado(tmp)
-                df_i = pd.read_excel(f, sheet_name=hoja_i, header=header_row)
-            else:
-                buffer = io.BytesIO(f.getvalue())
-                buffer.name = f.name
-                df_i = leer_csv_banco(buffer)
-            dfs_interno.append(df_i)
+        dfs_interno = cargar_subidos(archivos_interno, "Interno")
 
-    df_banco = pd.concat(dfs_banco, ignore_index=True)
-    df_interno = pd.concat(dfs_interno, ignore_index=True)
+    df_banco = unir_dataframes(dfs_banco)
+    df_interno = unir_dataframes(dfs_interno)
 
     # ---- Detectar columnas automáticamente ----
     f_b, i_b, deb_b, cred_b, d_b = detectar_columnas(df_banco)
@@ -267,9 +493,13 @@ if archivos_banco and archivos_interno:
                            index=(df_interno.columns.get_loc(d_i) if d_i in df_interno.columns else 0),
                            key="desc_i")
 
+    # ---- Quedarse solo con las columnas mapeadas (después de los selectbox, que listan todas) ----
+    df_banco = df_banco[columnas_usadas(f_b, i_b, deb_b, cred_b, d_b)].copy()
+    df_interno = df_interno[columnas_usadas(f_i, i_i, deb_i, cred_i, d_i)].copy()
+
     # ---- Filtro de fechas ----
-    df_banco[f_b] = pd.to_datetime(df_banco[f_b], errors="coerce").dt.floor("d")
-    df_interno[f_i] = pd.to_datetime(df_interno[f_i], errors="coerce").dt.floor("d")
+    df_banco[f_b] = parsear_fechas(df_banco[f_b]).dt.floor("d")
+    df_interno[f_i] = parsear_fechas(df_interno[f_i]).dt.floor("d")
 
     usar_rango = st.checkbox("Filtrar por rango de fechas", value=False)
     if usar_rango:
@@ -298,16 +528,8 @@ if archivos_banco and archivos_interno:
         df_interno[d_i] = normalizar_columna_descripcion(df_interno[d_i])
 
     # ---- Convertir a objetos Movimiento ----
-    movs_banco = [
-        Movimiento(f.date(), float(imp), str(desc), "Banco")
-        for f, imp, desc in zip(pd.to_datetime(df_banco[f_b], errors="coerce"), df_banco["importe_final"], df_banco[d_b])
-        if pd.notna(f) and pd.notna(imp) and imp != 0
-    ]
-    movs_interno = [
-        Movimiento(f.date(), float(imp), str(desc), "Interno")
-        for f, imp, desc in zip(pd.to_datetime(df_interno[f_i], errors="coerce"), df_interno["importe_final"], df_interno[d_i])
-        if pd.notna(f) and pd.notna(imp) and imp != 0
-    ]
+    movs_banco = construir_movimientos(df_banco, f_b, d_b, "Banco")
+    movs_interno = construir_movimientos(df_interno, f_i, d_i, "Interno")
 
     # ---- Parámetros de conciliación ----
     st.subheader("Parámetros de conciliación")
@@ -327,6 +549,12 @@ if archivos_banco and archivos_interno:
     with colp4:
         permitir_grupos_fuera = st.checkbox("Permitir grupos fuera de fecha",
                                             value=cfg.conciliacion.permitir_grupos_fuera_de_fecha)
+    usar_procesos = st.checkbox(
+        "Usar todos los núcleos (extractos grandes)",
+        value=False,
+        help="Reparte las sugerencias por tolerancia entre procesos cuando quedan muchos "
+             "movimientos de Banco pendientes. El resultado es el mismo.",
+    )
     
     # --- Filtros avanzados ---
     with st.expander("📅 Filtro por fecha"):
@@ -365,55 +593,22 @@ if archivos_banco and archivos_interno:
         permitir_grupos_fuera_de_fecha=permitir_grupos_fuera,
         fecha_desde=fecha_desde,
         fecha_hasta=fecha_hasta,
+        procesos=(os.cpu_count() or 1) if usar_procesos else 1,
     )
 
     # ---- Conciliación ----
     matches, pend_b, pend_i = conciliar(movs_banco, movs_interno, parametros)
 
     # ---- Construcción de tabla de salida ----
-    rows = []
-    for m in matches:
-        rows.append({
-            "fecha_banco": getattr(m, "fecha_banco", None),
-            "importe_banco": getattr(m, "importe_banco", None),
-            "desc_banco": getattr(m, "desc_banco", ""),
-            "fecha_interno": getattr(m, "fecha_interno", None),
-            "importe_interno": getattr(m, "importe_interno", None),
-            "desc_interno": getattr(m, "desc_interno", ""),
-            "estado": getattr(m, "estado", "Sin estado"),
-            "correccion_sugerida": getattr(m, "correccion_sugerida", ""),
-        })
-
-    for m in pend_b:
-        rows.append({
-            "fecha_banco": m.fecha,
-            "importe_banco": m.importe,
-            "desc_banco": m.descripcion,
-            "fecha_interno": pd.NaT,
-            "importe_interno": pd.NA,
-            "desc_interno": "",
-            "estado": "No conciliado (solo Banco)",
-            "correccion_sugerida": "Cargar en Interno / revisar",
-        })
-    for m in pend_i:
-        rows.append({
-            "fecha_banco": pd.NaT,
-            "importe_banco": pd.NA,
-            "desc_banco": "",
-            "fecha_interno": m.fecha,
-            "importe_interno": m.importe,
-            "desc_interno": m.descripcion,
-            "estado": "No conciliado (solo Interno)",
-            "correccion_sugerida": "Cargar en Banco / revisar",
-        })
-
-    salida = pd.DataFrame(rows)
+    salida = construir_salida(matches, pend_b, pend_i)
 
     # ---- Vista con filtros ----
     st.markdown("**Resultado**")
     salida_filtrada = salida
     if "estado" in salida.columns:
-        estados_unicos = sorted(salida["estado"].dropna().unique().tolist())
+        # Estados presentes, en el orden de las categorías (conciliados, sugeridos, no conciliados)
+        conteo_estados = salida["estado"].value_counts(sort=False)
+        estados_unicos = conteo_estados.index[conteo_estados > 0].tolist()
         estados_sel = st.multiselect(
             "Filtrar por estado",
             estados_unicos,
@@ -423,48 +618,30 @@ if archivos_banco and archivos_interno:
 
     filtro_texto = st.text_input("Buscar en descripciones", "")
     if filtro_texto:
-        salida_filtrada = salida_filtrada[
-            salida_filtrada["desc_banco"].str.contains(filtro_texto, case=False, na=False)
-            | salida_filtrada["desc_interno"].str.contains(filtro_texto, case=False, na=False)
-        ]
+        # Búsqueda literal (sin regex) sobre descripciones ya pasadas a minúsculas
+        clave = filtro_texto.lower()
+        mask = pd.Series(False, index=salida_filtrada.index)
+        for col in ("desc_banco", "desc_interno"):
+            mask |= salida_filtrada[col].astype("string").str.lower().str.contains(clave, regex=False, na=False)
+        salida_filtrada = salida_filtrada[mask]
 
     # ---- Mostrar tabla ----
-    def formatear_df_ui(df: pd.DataFrame):
-        formatos = {}
-        if "fecha_banco" in df.columns:
-            formatos["fecha_banco"] = lambda x: x.strftime("%d/%m/%Y") if pd.notnull(x) else ""
-        if "fecha_interno" in df.columns:
-            formatos["fecha_interno"] = lambda x: x.strftime("%d/%m/%Y") if pd.notnull(x) else ""
-        for col in ["importe_banco", "importe_interno"]:
-            if col in df.columns:
-                formatos[col] = lambda x: f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") if pd.notnull(x) else ""
-        return df.style.format(formatos)
-
     st.dataframe(formatear_df_ui(salida_filtrada), use_container_width=True)
 
     # ---- Resumen ----
     st.markdown("**Resumen**")
 
-    # Clasificación dinámica en pilares
-    def clasificar_estado(estado: str) -> str:
-        if estado.startswith("Conciliado"):
-            return "Conciliados"
-        elif estado.startswith("Sugerido"):
-            return "Sugeridos"
-        elif estado.startswith("No conciliado"):
-            return "No conciliados"
-        return "Otros"
-
     if "estado" in salida_filtrada.columns:
         # Contar por estado
         resumen_counts = salida_filtrada["estado"].value_counts()
+        resumen_counts = resumen_counts[resumen_counts > 0]  # la categórica cuenta también estados ausentes
 
         # Agregar columna pilar y ordenar por ella
         resumen = (
             resumen_counts
             .rename_axis("Estado")
             .reset_index(name="Cantidad")
-            .assign(Pilar=lambda df: df["Estado"].apply(clasificar_estado))
+            .assign(Pilar=lambda df: clasificar_estados(df["Estado"]))
             .sort_values(
                 ["Pilar", "Estado"],
                 key=lambda col: col.map({"Conciliados": 1, "Sugeridos": 2, "No conciliados": 3, "Otros": 4}),
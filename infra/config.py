@@ -1,6 +1,8 @@
 from __future__ import annotations
+import os
 import yaml
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -35,6 +37,12 @@ class Config:
 
 
 def load_config(path: str | Path = "config.yaml") -> Config:
+    """Carga la configuración; el parseo se cachea por (ruta, mtime) y se renueva si el archivo cambia."""
+    return _load_config(str(path), os.path.getmtime(path))
+
+
+@lru_cache(maxsize=8)
+def _load_config(path: str, mtime: float) -> Config:
     with open(path, "r", encoding="utf-8") as f:
         data = yaml.safe_load(f)
 
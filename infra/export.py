@@ -1,7 +1,14 @@
 from __future__ import annotations
 import io
 import pandas as pd
-from openpyxl.styles import numbers
+
+# Día 0 del sistema de fechas de Excel (serial 1 = 1900-01-01, con el bug del 29/02/1900)
+_EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+
+
+def _a_serial_excel(serie: pd.Series) -> pd.Series:
+    """Convierte una columna datetime64 a número de serie de Excel (float; NaN si falta la fecha)."""
+    return (serie - _EXCEL_EPOCH) / pd.Timedelta(days=1)
 
 
 def dataframe_a_excel_bytes(
@@ -12,18 +19,24 @@ def dataframe_a_excel_bytes(
     """
     Exporta un DataFrame a Excel conservando los tipos fecha (no texto).
     Si se pasa `formato_columnas_fecha` con {nombre_columna: "DD/MM/YYYY"}, aplica number_format.
+
+    Las columnas con formato se escriben como serial de Excel y el formato se asigna
+    una vez por columna (set_column), sin recorrer celda por celda. Solo se convierten las
+    columnas datetime64: las de texto se exportan tal cual (no se adivina el orden día/mes).
     """
+    formatos = {
+        c: f for c, f in (formato_columnas_fecha or {}).items()
+        if c in df.columns and pd.api.types.is_datetime64_any_dtype(df[c])
+    }
+    if formatos:
+        df = df.assign(**{c: _a_serial_excel(df[c]) for c in formatos})
+
     buff = io.BytesIO()
-    with pd.ExcelWriter(buff, engine="openpyxl") as writer:
+    with pd.ExcelWriter(buff, engine="xlsxwriter") as writer:
         df.to_excel(writer, index=False, sheet_name=sheet_name)
-        if formato_columnas_fecha:
-            ws = writer.sheets[sheet_name]
-            # Mapear nombres de columnas a letras
-            headers = [c.value for c in ws[1]]
-            for col_name, fmt in formato_columnas_fecha.items():
-                if col_name in headers:
-                    col_idx = headers.index(col_name) + 1
-                    col_letter = ws.cell(row=1, column=col_idx).column_letter
-                    for cell in ws[col_letter][1:]:
-                        cell.number_format = fmt
+        if formatos:
+            wb, ws = writer.book, writer.sheets[sheet_name]
+            for col_name, fmt in formatos.items():
+                col_idx = df.columns.get_loc(col_name)
+                ws.set_column(col_idx, col_idx, 12, wb.add_format({"num_format": fmt}))
     return buff.getvalue()
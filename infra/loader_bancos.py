@@ -1,9 +1,16 @@
+import codecs
+import csv
 import io
 import math
 import numbers
-from typing import Tuple, Union, TextIO, BinaryIO
+import os
+from collections import defaultdict
+from functools import lru_cache
+from typing import Sequence, Tuple, Union, TextIO, BinaryIO
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 import re
 import unicodedata
 
@@ -37,6 +44,9 @@ BANCOS = {
             "Tipo de Movimiento",
             "Saldo",
         ],
+        "categoricas": ["Origen", "Grupo de Conceptos", "Concepto", "Tipo de Movimiento"],
+        # Columnas que siempre son texto: se leen como str sin pasar por la inferencia de tipos
+        "dtypes": {"Fecha": "str", "Descripción": "str", "Concepto": "str", "Tipo de Movimiento": "str"},
         "nombre": "Banco Galicia",
     },
     "nacion": {
@@ -45,6 +55,8 @@ BANCOS = {
         "encoding": "latin1",
         "fecha_format": "%d/%m/%Y",
         "cols": ["Fecha", "Comprobante", "Concepto", "Importe", "Saldo"],
+        "categoricas": ["Concepto"],
+        "dtypes": {"Fecha": "str", "Concepto": "str", "Importe": "str", "Saldo": "str"},  # importes con "$"
         "nombre": "Banco NaciÃ³n",
     },
     "supervielle": {
@@ -53,6 +65,7 @@ BANCOS = {
         "encoding": "latin1",  # suele ser cp1252 también
         "fecha_format": "%Y/%m/%d %H:%M",
         "cols": ["Fecha", "Concepto", "Detalle", "Descripcion", "Debito", "Credito", "Saldo"],
+        "categoricas": ["Concepto"],
         "nombre": "Banco Supervielle",
     },
     "ciudad": {
@@ -69,6 +82,8 @@ BANCOS = {
             "Descripción",
             "Saldo",
         ],
+        "categoricas": ["Cuenta", "CUIT Cuenta"],
+        "dtypes": {"Cuenta": "str", "Fecha": "str", "Descripción": "str"},
         "nombre": "Banco Ciudad",
     },
 }
@@ -108,6 +123,58 @@ def _as_text_io(obj: Union[str, TextIO, BinaryIO]) -> Tuple[TextIO, bool]:
     raise TypeError("Objeto de archivo no soportado para lectura de cabecera")
 
 
+_ENCODINGS_CSV = ("utf-8-sig", "cp1252", "latin1")
+_BYTES_MUESTRA = 65536
+
+
+def _encodings_a_probar(primero: str | None) -> tuple[str | None, ...]:
+    """Encodings to try in order: the sniffed one, then the single-byte fallbacks.
+
+    Text streams (None) are already decoded, so there is nothing to retry.
+    """
+    if primero is None:
+        return (None,)
+    return tuple(dict.fromkeys((primero, "cp1252", "latin1")))
+
+
+def _detectar_encoding(obj: Union[str, TextIO, BinaryIO]) -> str | None:
+    """Detect the CSV encoding from a byte prefix (first strict decode wins; latin1 never fails).
+
+    Returns None for text streams, where the encoding is already resolved.
+    """
+    if isinstance(obj, str):
+        with open(obj, "rb") as f:
+            muestra = f.read(_BYTES_MUESTRA)
+    elif isinstance(obj, io.TextIOBase):
+        return None
+    else:
+        try:
+            obj.seek(0)
+        except Exception:
+            pass
+        muestra = obj.read(_BYTES_MUESTRA)
+        try:
+            obj.seek(0)
+        except Exception:
+            pass
+        if isinstance(muestra, str):
+            return None
+
+    for enc in _ENCODINGS_CSV:
+        try:
+            # final=False: a multibyte char cut at the end of the prefix is not an error
+            codecs.getincrementaldecoder(enc)().decode(muestra, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return "latin1"
+
+
+# Secuencias que deja UTF-8 leído como latin1/cp1252; sin ellas no hay nada que reparar
+_FIRMAS_MOJIBAKE = ("\u00c3", "\u00c2", "ï¿½", "\ufffd", "ï»¿")
+
+
+@lru_cache(maxsize=4096)
 def _demojibake_text(s: str) -> str:
     """Attempt to fix typical UTF-8 text decoded as latin1/cp1252 (mojibake).
 
@@ -116,6 +183,10 @@ def _demojibake_text(s: str) -> str:
     """
     if not isinstance(s, str):
         return s
+    if s.isascii():  # sin bytes altos no hay mojibake posible
+        return s
+    if not any(firma in s for firma in _FIRMAS_MOJIBAKE):
+        return s.lstrip("\ufeff")
     candidates = [s]
     for src in ("latin1", "cp1252"):
         try:
@@ -132,28 +203,77 @@ def _demojibake_text(s: str) -> str:
     return best.lstrip("\ufeff")
 
 
-def _split_header(line: str) -> list:
-    """Split header trying common separators and stripping quotes/spaces.
+_SEPARADORES_CABECERA = ",;\t"
+_BYTES_CABECERA = 4096
+
+
+def _sniff_delimiter(sample: str) -> str:
+    """Detect the field separator with csv.Sniffer over a text prefix.
+
+    Falls back to the most frequent candidate when the sniffer can't decide
+    (e.g. a single-column header).
+    """
+    try:
+        sep = csv.Sniffer().sniff(sample, delimiters=_SEPARADORES_CABECERA).delimiter
+    except csv.Error:
+        sep = None
+    primera = sample.split("\n", 1)[0]
+    if sep is None or sep not in primera:
+        sep = max(_SEPARADORES_CABECERA, key=primera.count)
+    return sep
+
+
+def _split_header(line: str, sep: str | None = None) -> list:
+    """Split a header line with csv.reader, stripping quotes/spaces.
 
-    Handles BOM and empty lines gracefully.
+    Handles BOM and empty lines gracefully. Without `sep` the separator is sniffed
+    from the line itself.
     """
     line = _demojibake_text(str(line))
     line = line.replace("ï»¿", "").lstrip("\ufeff").strip()  # Quitar BOM real y mojibake ("ï»¿")
     if not line:
         return []
-    cand_seps = {",", ";", "\t"}
-    # Try to detect by presence count; pick the most likely
-    best = max(cand_seps, key=lambda s: line.count(s))
-    parts = [p.strip().strip('"').strip("'") for p in line.split(best)]
+    if sep is None:
+        sep = _sniff_delimiter(line)
+    row = next(csv.reader([line], delimiter=sep), [])
+    parts = [p.strip().strip('"').strip("'") for p in row]
     # remove empties in case of trailing separator
     return [p for p in parts if p]
 
 
+def _read_header(f: TextIO) -> list:
+    """Read a fixed prefix, sniff the separator once and parse the first non-empty header row."""
+    sample = f.read(_BYTES_CABECERA)
+    lines = sample.splitlines()
+    if len(sample) == _BYTES_CABECERA and len(lines) > 1:
+        lines.pop()  # última línea posiblemente truncada
+    for pos, line in enumerate(lines):
+        if _split_header(line):
+            return _split_header(line, sep=_sniff_delimiter("\n".join(lines[pos:])))
+    return []
+
+
+@lru_cache(maxsize=4096)
 def _strip_accents(text: str) -> str:
-    normalized = unicodedata.normalize("NFKD", str(text))
+    text = str(text)
+    if text.isascii():  # nada que descomponer ni descartar
+        return text
+    normalized = unicodedata.normalize("NFKD", text)
     return normalized.encode("ascii", "ignore").decode("ascii", "ignore")
 
 
+# Precompiled patterns used by _keyize (called once per header cell/column)
+_RE_PALABRAS_ROTAS = (
+    (re.compile(r"d.?bito"), "debito"),
+    (re.compile(r"cr.?dito"), "credito"),
+    (re.compile(r"descripci.?n"), "descripcion"),
+    (re.compile(r"n.?mero"), "numero"),
+)
+_RE_NO_ALFANUM = re.compile(r"[^0-9a-z\s]")
+_RE_ESPACIOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
 def _keyize(text: str) -> str:
     """Key form for tolerant comparisons: lowercased, accentless, alnum+space only.
 
@@ -173,13 +293,11 @@ def _keyize(text: str) -> str:
     ):
         text = text.replace(bad, good)
     t = _strip_accents(_demojibake_text(text)).lower()
-    t = re.sub(r"d.?bito", "debito", t)
-    t = re.sub(r"cr.?dito", "credito", t)
-    t = re.sub(r"descripci.?n", "descripcion", t)
-    t = re.sub(r"n.?mero", "numero", t)
+    for patron, reemplazo in _RE_PALABRAS_ROTAS:
+        t = patron.sub(reemplazo, t)
     t = t.replace("ï¿½", "")
-    t = re.sub(r"[^0-9a-z\s]", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
+    t = _RE_NO_ALFANUM.sub(" ", t)
+    t = _RE_ESPACIOS.sub(" ", t).strip()
     return t
 
 
@@ -196,6 +314,45 @@ def _build_expected_keymap(cols: list[str]) -> dict[str, str]:
     return mapping
 
 
+# Claves normalizadas de las columnas esperadas: constantes, se calculan una vez al importar
+for _cfg in BANCOS.values():
+    _cfg["_col_keys"] = tuple(_keyize(c) for c in _cfg["cols"])
+    _cfg["_key_to_canonical"] = _build_expected_keymap(_cfg["cols"])
+del _cfg
+
+# Detección: un prefijo exacto implica las dos primeras claves iguales, así que el banco queda
+# determinado por ellas (ante prefijos repetidos gana el primero de BANCOS, como en el recorrido)
+_DETECT_INDEX: dict[tuple[str, ...], str] = {}
+for _banco, _cfg in BANCOS.items():
+    _DETECT_INDEX.setdefault(_cfg["_col_keys"][:2], _banco)
+del _banco, _cfg
+
+
+def _key_index(df: pd.DataFrame) -> dict[str, list[str]]:
+    """Columns of `df` grouped by normalized key, in one pass (column order kept within each key)."""
+    out: defaultdict[str, list[str]] = defaultdict(list)
+    for c in df.columns:
+        out[_keyize(c)].append(c)
+    return out
+
+
+@lru_cache(maxsize=256)
+def _keymap(columns: tuple) -> dict[str, str]:
+    """Map from normalized key to the first column with that key (cached per column tuple; read-only)."""
+    mapping: dict[str, str] = {}
+    for c in columns:
+        mapping.setdefault(_keyize(c), c)
+    return mapping
+
+
+def col_for(df: pd.DataFrame, key: str) -> str | None:
+    """Column of `df` whose normalized name is `key` (None if there is none).
+
+    The key map is built once per distinct set of columns, so repeated lookups are O(1).
+    """
+    return _keymap(tuple(df.columns)).get(key)
+
+
 def _canonicalize_columns(df: pd.DataFrame, cfg: dict) -> pd.DataFrame:
     """Devuelve un DataFrame con columnas canÃ³nicas ordenadas y extras al final.
 
@@ -204,116 +361,134 @@ def _canonicalize_columns(df: pd.DataFrame, cfg: dict) -> pd.DataFrame:
     - Inserta columnas faltantes con NA
     - Concatena columnas extra (no mapeadas) al final, sin duplicados
     """
-    df = df.copy()
-    df.columns = [str(c).strip() for c in df.columns]
+    df = df.set_axis([str(c).strip() for c in df.columns], axis=1)
 
     exp_cols = cfg["cols"]
-    key_to_expected = { _keyize(c): c for c in exp_cols }
+    key_to_expected = cfg["_key_to_canonical"]
 
-    # Primer match existente por clave normalizada
-    key_to_source: dict[str, str] = {}
+    # Primer match existente por clave normalizada -> nombre canÃ³nico
+    rename_map: dict[str, str] = {}
     for col in df.columns:
         key = _keyize(col)
-        if key in key_to_expected and key not in key_to_source:
-            key_to_source[key] = col
-
-    aligned: dict[str, pd.Series] = {}
-    for exp in exp_cols:
-        key = _keyize(exp)
-        if key in key_to_source:
-            aligned[exp] = df[key_to_source[key]].copy()
-        else:
-            aligned[exp] = pd.Series(pd.NA, index=df.index, name=exp)
+        if key in key_to_expected and key_to_expected[key] not in rename_map.values():
+            rename_map[col] = key_to_expected[key]
 
-    result = pd.DataFrame(aligned)
+    df = df.rename(columns=rename_map)
+    df = df.loc[:, ~df.columns.duplicated(keep="first")]
 
-    # Extras (columnas no mapeadas), preservando orden original y evitando duplicados
-    mapped_cols = set(key_to_source.values())
-    extras: list[str] = []
-    for col in df.columns:
-        if col in mapped_cols:
-            continue
-        if col in extras or col in result.columns:
-            continue
-        extras.append(col)
+    # CanÃ³nicas en orden (faltantes con NA) y extras al final en su orden original
+    canonicas = set(exp_cols)
+    extras = [c for c in df.columns if c not in canonicas]
+    return df.reindex(columns=exp_cols + extras, fill_value=pd.NA)
 
-    if extras:
-        extras_df = df[extras].copy()
-        # Quitar duplicados por nombre en extras
-        extras_df = extras_df.loc[:, ~extras_df.columns.duplicated(keep="first")]
-        result = pd.concat([result, extras_df], axis=1)
 
-    # Asegurar unicidad final
-    if result.columns.duplicated().any():
-        result = result.loc[:, ~result.columns.duplicated(keep="first")]
+def _desc_texto(value: str) -> str | None:
+    text = _demojibake_text(value).strip()
+    if not text:
+        return None
+    lowered = text.lower()
+    if lowered in {"nan", "none", "null"}:
+        return None
+    return text
 
-    return result
 
+def _desc_entero(value) -> str:
+    return str(int(value))
 
-def _normalize_desc_value(value: object) -> str | None:
-    if value is None or value is pd.NA:
+
+def _desc_real(value) -> str | None:
+    if math.isnan(float(value)):
         return None
-    if isinstance(value, str):
-        text = _demojibake_text(value).strip()
-        if not text:
-            return None
-        lowered = text.lower()
-        if lowered in {"nan", "none", "null"}:
-            return None
-        return text
-    if isinstance(value, numbers.Integral) and not isinstance(value, bool):
+    if float(value).is_integer():
         return str(int(value))
-    if isinstance(value, numbers.Real) and not isinstance(value, bool):
-        if math.isnan(float(value)):
-            return None
-        if float(value).is_integer():
-            return str(int(value))
-        text = f"{value}"
-        text = text.rstrip("0").rstrip(".")
-        return text
+    text = f"{value}"
+    text = text.rstrip("0").rstrip(".")
+    return text
+
+
+def _desc_otro(value: object) -> str | None:
     text = str(value).strip()
     if not text:
         return None
     return text
 
 
+# Despacho por tipo exacto (evita los isinstance contra ABCs de numbers en cada celda)
+_DESC_HANDLERS = {
+    str: _desc_texto,
+    int: _desc_entero,
+    float: _desc_real,
+    np.int64: _desc_entero,
+    np.int32: _desc_entero,
+    np.float64: _desc_real,
+    np.float32: _desc_real,
+    bool: _desc_otro,
+    np.bool_: _desc_otro,
+}
+
+
+def _normalize_desc_value(value: object) -> str | None:
+    if value is None or value is pd.NA:
+        return None
+    handler = _DESC_HANDLERS.get(type(value))
+    if handler is not None:
+        return handler(value)
+    # Subclases y tipos no registrados: mismo orden de chequeo que antes
+    if isinstance(value, str):
+        return _desc_texto(value)
+    if isinstance(value, numbers.Integral) and not isinstance(value, bool):
+        return _desc_entero(value)
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return _desc_real(value)
+    return _desc_otro(value)
+
+
 def _unificar_descripcion(df: pd.DataFrame, banco_cfg: dict) -> pd.DataFrame:
     """Combina columnas descriptivas en una Ãºnica columna canÃ³nica."""
     if not _DESCRIP_KEYS:
         return df
 
-    desc_candidates = [col for col in df.columns if _keyize(col) in _DESCRIP_KEYS]
+    col_keys = [(col, _keyize(col)) for col in df.columns]
+    desc_candidates = [col for col, key in col_keys if key in _DESCRIP_KEYS]
     if not desc_candidates:
         return df
 
     expected_cols = banco_cfg.get("cols", [])
-    desc_target = None
-    for col in expected_cols:
-        if _keyize(col) == "descripcion":
-            desc_target = col
-            break
+    desc_target = banco_cfg["_key_to_canonical"].get("descripcion")
     if desc_target is None:
         return df
 
+    # Normalizar por columna sobre los valores únicos (factorize); las filas se combinan una vez
+    # por combinación distinta de códigos (np.unique por filas) y se expanden con el inverso
     subset = df[desc_candidates]
-    combined_values: list[object] = []
-    for row in subset.itertuples(index=False, name=None):
-        seen: set[str] = set()
-        parts: list[str] = []
-        for val in row:
+    codigos: list[np.ndarray] = []
+    columnas: list[list[tuple[str, str] | None]] = []
+    for k in range(subset.shape[1]):
+        codes, uniques = pd.factorize(subset.iloc[:, k])
+        normalizados = []
+        for val in uniques:
             text = _normalize_desc_value(val)
-            if not text:
-                continue
-            key = text.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            parts.append(text)
-        combined_values.append(" ".join(parts) if parts else pd.NA)
-
-    combined_series = pd.Series(combined_values, index=df.index, dtype="object", name=desc_target)
-
-    descripcion_cols = [col for col in df.columns if _keyize(col) == "descripcion"]
+            normalizados.append((text, text.lower()) if text else None)
+        normalizados.append(None)  # code -1 (NA)
+        codigos.append(codes)
+        columnas.append(normalizados)
+
+    filas_unicas, inverso = np.unique(np.column_stack(codigos), axis=0, return_inverse=True)
+    combinados = np.empty(len(filas_unicas), dtype=object)
+    for n, fila in enumerate(filas_unicas):
+        # clave en minúsculas -> primer texto visto (dedup sin distinguir mayúsculas, en orden)
+        parts: dict[str, str] = {}
+        for normalizados, code in zip(columnas, fila):
+            item = normalizados[code]
+            if item is not None:
+                parts.setdefault(item[1], item[0])
+        combinados[n] = " ".join(parts.values()) if parts else pd.NA
+    combined_values = combinados[inverso.reshape(-1)]
+
+    # StringDtype (faltantes como pd.NA): la columna es siempre texto, sin celdas mixtas en object
+    combined_series = pd.Series(combined_values, index=df.index, dtype="string", name=desc_target)
+
+    descripcion_cols = [col for col, key in col_keys if key == "descripcion"]
     df_result = df.drop(columns=descripcion_cols, errors="ignore")
 
     df_result[desc_target] = combined_series
@@ -333,14 +508,7 @@ def detectar_banco_tolerante(path_or_file: Union[str, TextIO, BinaryIO]) -> str:
     f, is_temp = _as_text_io(path_or_file)
     try:
         # Leer hasta encontrar una lÃ­nea no vacÃ­a de cabecera
-        first = ""
-        while True:
-            chunk = f.readline()
-            if not chunk:
-                break  # EOF
-            if _split_header(chunk):
-                first = chunk
-                break
+        cols = _read_header(f)
     finally:
         try:
             f.seek(0)
@@ -355,24 +523,18 @@ def detectar_banco_tolerante(path_or_file: Union[str, TextIO, BinaryIO]) -> str:
                 except Exception:
                     pass
 
-    cols = _split_header(first)
-    cols_keys = [_keyize(c) for c in cols]
-
-    for banco, cfg in BANCOS.items():
-        esperado = cfg["cols"]
-        esperado_keys = [_keyize(c) for c in esperado]
-        if cols_keys[: len(esperado_keys)] == esperado_keys or (
-            len(cols_keys) >= 2 and esperado_keys[:2] == cols_keys[:2]
-        ):
-            return banco
+    cols_keys = tuple(_keyize(c) for c in cols)
+    banco = _DETECT_INDEX.get(cols_keys[:2]) if len(cols_keys) >= 2 else None
+    if banco is not None:
+        return banco
     raise ValueError(f"â ï¸ No se pudo detectar el banco automÃ¡ticamente. Cabecera leÃ­da: {cols}")
 
 
 def validar_columnas_tolerante(df: pd.DataFrame, banco: str) -> None:
     esperado = BANCOS[banco]["cols"]
     cols = [str(c).strip() for c in df.columns.tolist()]
-    exp_keys = [_keyize(c) for c in esperado]
-    got_keys = [_keyize(c) for c in cols]
+    exp_keys = BANCOS[banco]["_col_keys"]
+    got_keys = tuple(_keyize(c) for c in cols)
     if got_keys[: len(exp_keys)] != exp_keys:
         nombre = BANCOS[banco].get("nombre", banco.title())
         raise ValueError(
@@ -426,34 +588,265 @@ def validar_columnas(df: pd.DataFrame, banco: str) -> None:
         )
 
 
+_SUPERVIELLE_IMPORTES = ("Debito", "Credito", "Saldo")
+
+# Lector CSV opcional: polars (multihilo) si está instalado y se habilita por variable de entorno
+_USE_POLARS = os.environ.get("CONCILIADOR_USE_POLARS", "").strip().lower() in ("1", "true", "yes", "si")
+
+
+# Archivos en disco más grandes que esto se parsean por partes (memoria acotada del parser)
+_BYTES_LECTURA_POR_PARTES = 50 * 1024 * 1024
+_FILAS_POR_PARTE = 200_000
+
+# Motor de pandas para el lector CSV: "c" (por defecto) o "pyarrow" (multihilo, requiere pyarrow)
+_CSV_ENGINE = os.environ.get("CONCILIADOR_CSV_ENGINE", "c").strip().lower()
+
+
+def _read_csv_polars(
+    file_obj: Union[str, TextIO, BinaryIO],
+    sep: str,
+    decimal: str,
+    encoding: str | None,
+    as_text: bool,
+    columns: Sequence[str] | None,
+) -> pd.DataFrame:
+    """Parse with a lazy polars scan (projection pushdown) and hand back a pandas DataFrame.
+
+    polars only reads UTF-8, so the content is decoded with the detected encoding first.
+    Raises ImportError when polars isn't installed.
+    """
+    import polars as pl
+
+    if isinstance(file_obj, str):
+        with open(file_obj, "rb") as fh:
+            data = fh.read()
+    else:
+        data = file_obj.read()
+    if isinstance(data, bytes):
+        data = data.decode(encoding or "utf-8")
+    data = data.lstrip("\ufeff").encode("utf-8")
+
+    lf = pl.scan_csv(
+        io.BytesIO(data),
+        separator=sep,
+        # polars rejects decimal_comma with a comma separator; those banks' amounts are text anyway
+        decimal_comma=decimal == "," and sep != ",",
+        infer_schema=not as_text,
+    )
+    if columns is not None:
+        wanted = frozenset(map(_keyize, columns))
+        lf = lf.select([c for c in lf.collect_schema().names() if _keyize(c) in wanted])
+    # Blank lines come back as all-null rows; pandas skips them (skip_blank_lines=True)
+    lf = lf.filter(~pl.all_horizontal(pl.all().is_null()))
+    if as_text:
+        # Like keep_default_na=False: empty cells stay "" (every column is String here)
+        lf = lf.fill_null("")
+    return lf.collect().to_pandas()
+
+
+def _read_csv_arrow(
+    file_obj: Union[str, TextIO, BinaryIO],
+    sep: str,
+    decimal: str,
+    encoding: str | None,
+    dtypes: dict[str, str] | None,
+) -> pd.DataFrame:
+    """Parse with pyarrow.csv (multithreaded, 1 MiB blocks) and convert the Table once to pandas.
+
+    Raises ImportError when pyarrow isn't installed.
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    if isinstance(file_obj, str):
+        source = file_obj
+    else:
+        data = file_obj.read()
+        if isinstance(data, str):
+            data, encoding = data.encode("utf-8"), "utf-8"
+        source = io.BytesIO(data)
+
+    table = pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=1 << 20, encoding=encoding or "utf-8"),
+        parse_options=pa_csv.ParseOptions(delimiter=sep),
+        convert_options=pa_csv.ConvertOptions(
+            decimal_point=decimal,
+            strings_can_be_null=True,
+            column_types={c: pa.string() for c in (dtypes or {})},
+        ),
+    )
+    return table.to_pandas(self_destruct=True)
+
+
+def _read_csv(
+    file_obj: Union[str, TextIO, BinaryIO],
+    sep: str,
+    decimal: str,
+    encoding: str | None,
+    as_text: bool = False,
+    columns: Sequence[str] | None = None,
+    dtypes: dict[str, str] | None = None,
+    categoricas: Sequence[str] = (),
+) -> pd.DataFrame:
+    """Read a bank CSV with pandas' C engine, or polars when CONCILIADOR_USE_POLARS is set.
+
+    `as_text` keeps every cell as a string (empty cells as ""), like dtype=str + keep_default_na=False.
+    `columns` restricts parsing to the headers with the same _keyize key ("Débito" matches "Debito");
+    missing ones are simply absent from the result.
+    `dtypes` fixes the type of known columns (skips inference for them); unknown headers are ignored.
+    Large files on disk are parsed in chunks of _FILAS_POR_PARTE rows; the text columns listed in
+    `categoricas` are stored as category per chunk (see _concatenar_partes).
+    With CONCILIADOR_CSV_ENGINE=pyarrow typed reads go straight through pyarrow.csv; text reads
+    stay on C, since Arrow converts cells before honoring dtype=str (e.g. "500,00" -> 50000).
+    Any polars/pyarrow failure (not installed, unsupported input) falls back to the C engine.
+    """
+    if _USE_POLARS:
+        try:
+            return _read_csv_polars(file_obj, sep, decimal, encoding, as_text, columns)
+        except Exception:
+            if hasattr(file_obj, "seek"):
+                file_obj.seek(0)
+    extra = {"dtype": str, "keep_default_na": False} if as_text else {"dtype": dtypes}
+    if _CSV_ENGINE == "pyarrow" and not as_text:
+        try:
+            df = _read_csv_arrow(file_obj, sep, decimal, encoding, dtypes)
+            if columns is not None:
+                wanted = frozenset(map(_keyize, columns))
+                df = df[[c for c in df.columns if _keyize(c) in wanted]]
+            return df
+        except Exception:
+            if hasattr(file_obj, "seek"):
+                file_obj.seek(0)
+    if columns is not None:
+        wanted = frozenset(map(_keyize, columns))
+        extra["usecols"] = lambda c: _keyize(c) in wanted
+    if isinstance(file_obj, str) and os.path.getsize(file_obj) > _BYTES_LECTURA_POR_PARTES:
+        extra["chunksize"] = _FILAS_POR_PARTE
+    df = pd.read_csv(
+        file_obj,
+        sep=sep,
+        decimal=decimal,
+        encoding=encoding,
+        engine="c",
+        skip_blank_lines=True,
+        **extra,
+    )
+    if isinstance(df, pd.DataFrame):
+        return df
+    # Solo columnas que son texto en todas las partes: sus categorías se unen sin conversiones
+    texto = [c for c in categoricas if as_text or (dtypes or {}).get(c) == "str"]
+    with df as reader:
+        return _concatenar_partes(reader, texto)
+
+
+def _concatenar_partes(partes, categoricas: Sequence[str]) -> pd.DataFrame:
+    """Concatenate chunked reads keeping the repeated-text columns small.
+
+    Each chunk's `categoricas` columns become category as soon as it is parsed, so the parts
+    accumulated before the concat hold integer codes instead of repeated strings. The per-chunk
+    categories are merged with union_categoricals (sorted, like astype("category") on the whole
+    column), so the result matches a single read followed by that cast.
+    """
+    reducidas: list[pd.DataFrame] = []
+    for parte in partes:
+        for c in categoricas:
+            if c in parte.columns:
+                parte[c] = parte[c].astype("category")
+        reducidas.append(parte)
+
+    cols_cat = [c for c in categoricas if c in reducidas[0].columns]
+    df = pd.concat([p.drop(columns=cols_cat) for p in reducidas], ignore_index=True)
+    for c in cols_cat:
+        union = union_categoricals([p[c] for p in reducidas], sort_categories=True)
+        df.insert(reducidas[0].columns.get_loc(c), c, union)
+    return df
+
+
 def _to_float(series: pd.Series) -> pd.Series:
     return pd.to_numeric(series, errors="coerce")
 
 
+# Importes en formato AR ("$ 1.234,56") -> "1234.56" en una sola pasada de str.translate
+_TRADUCCION_IMPORTE = str.maketrans({".": None, ",": "."})
+_TRADUCCION_IMPORTE_PESOS = str.maketrans({"$": None, ".": None, ",": "."})
+
+
 def normalizar_importes(df: pd.DataFrame, banco: str) -> pd.DataFrame:
     """Convierte importes a float segÃºn reglas de cada banco."""
     if banco == "nacion":
         for col in ["Importe", "Saldo"]:
             if col in df.columns:
-                s = df[col].astype(str).str.replace(r"[\$\.]", "", regex=True)
-                s = s.str.replace(",", ".", regex=False)
-                df[col] = _to_float(s)
+                df[col] = _to_float(df[col].astype(str).str.translate(_TRADUCCION_IMPORTE_PESOS))
     elif banco == "supervielle":
+        claves = _keymap(tuple(df.columns))
         for canonical in ["debito", "credito", "saldo"]:
-            target = next((col for col in df.columns if _keyize(col) == canonical), None)
+            target = claves.get(canonical)
             if target is None:
                 continue
             if pd.api.types.is_numeric_dtype(df[target]):
                 continue
-            series = df[target].astype(str).str.replace(".", "", regex=False)
-            series = series.str.replace(",", ".", regex=False)
-            df[target] = _to_float(series)
+            df[target] = _to_float(df[target].astype(str).str.translate(_TRADUCCION_IMPORTE))
     elif banco in ["galicia", "ciudad"]:
         # pandas respeta decimal="," en read_csv; no acciÃ³n adicional
         pass
     return df
 
 
+def _leer_csv_banco(file_obj, banco: str, cfg: dict, enc: str | None) -> pd.DataFrame:
+    """Read a non-Galicia bank CSV with a fixed encoding and validate its columns.
+
+    Raises ValueError (UnicodeDecodeError, pd.errors.ParserError or a failed validation)
+    so cargar_banco can retry with the next candidate encoding.
+    """
+    if banco == "supervielle":
+        # Leer todo como texto para evitar inferencias erróneas
+        df = _read_csv(
+            file_obj, cfg["sep"], cfg["decimal"], enc, as_text=True,
+            categoricas=cfg.get("categoricas", ()),
+        )
+    else:
+        df = _read_csv(
+            file_obj, cfg["sep"], cfg["decimal"], enc,
+            dtypes=cfg.get("dtypes"), categoricas=cfg.get("categoricas", ()),
+        )
+
+    if banco == "supervielle":
+        # Renombrar columnas comunes a canónicas
+        rename_map = {
+            "D?bito": "Debito", "Débito": "Debito",
+            "Cr?dito": "Credito", "Credito": "Credito",
+            "Detalle": "Detalle", "Concepto": "Concepto",
+            "Saldo": "Saldo", "Descripcion": "Descripcion",
+        }
+        df = df.rename(columns={c: rename_map.get(c, c) for c in df.columns})
+
+    if banco == "supervielle" and "Descripción" not in df.columns:
+        idx = df.columns.get_loc("Detalle") + 1 if "Detalle" in df.columns else len(df.columns)
+        df.insert(idx, "Descripción", pd.NA)
+    # Fallback: si quedó una sola columna, intentar auto-detectar separador
+    if df.shape[1] == 1:
+        try:
+            if hasattr(file_obj, "seek"):
+                file_obj.seek(0)
+        except Exception:
+            pass
+        try:
+            df = pd.read_csv(
+                file_obj,
+                sep=None,
+                engine="python",
+                encoding=enc,
+                decimal=cfg["decimal"],
+                skip_blank_lines=True,
+                keep_default_na=False,
+            )
+        except Exception:
+            pass
+    validar_columnas_tolerante(df, banco)
+    return df
+
+
 def cargar_banco(path_or_file: Union[str, TextIO, BinaryIO]) -> Tuple[pd.DataFrame, str]:
     """Carga un extracto bancario, normaliza y devuelve (df, banco).
 
@@ -474,7 +867,6 @@ def cargar_banco(path_or_file: Union[str, TextIO, BinaryIO]) -> Tuple[pd.DataFra
         file_obj = path_or_file
 
     df = None
-    last_err: Exception | None = None
 
     # Caso especial: Banco Galicia (UTF-8 con BOM, comillas y ; final)
     if banco == "galicia":
@@ -484,14 +876,14 @@ def cargar_banco(path_or_file: Union[str, TextIO, BinaryIO]) -> Tuple[pd.DataFra
                 sep=cfg["sep"],
                 decimal=cfg["decimal"],
                 encoding="utf-8-sig",  # limpia BOM
-                engine="python",
+                engine="c",
                 quotechar='"',         # importante para DescripciÃ³n
+                dtype=cfg["dtypes"],
                 skip_blank_lines=True,
                 header=0,
                 index_col=False,
             )
             # Eliminar solo columnas realmente extra por ';' final
-            expected_keys = { _keyize(c) for c in cfg["cols"] }
             to_drop = []
             for col in df.columns:
                 name = str(col)
@@ -506,7 +898,7 @@ def cargar_banco(path_or_file: Union[str, TextIO, BinaryIO]) -> Tuple[pd.DataFra
 
             # Renombrar a canÃ³nico y reordenar antes de validar
             exp_cols = cfg["cols"]
-            key_to_canonical = { _keyize(c): c for c in exp_cols }
+            key_to_canonical = cfg["_key_to_canonical"]
             rename_map: dict[str, str] = {}
             for c in list(df.columns):
                 k = _keyize(c)
@@ -523,87 +915,24 @@ def cargar_banco(path_or_file: Union[str, TextIO, BinaryIO]) -> Tuple[pd.DataFra
             raise ValueError(f"Error leyendo CSV de Galicia: {e}")
 
     else:
-        # Intentar con mÃºltiples encodings comunes
-        preferred = ("utf-8-sig", "utf-8", "cp1252")
-        first_enc = cfg.get("encoding", "latin1")
-        encodings_try: list[str] = []
-        for enc in (*preferred, first_enc, "latin1"):
-            if enc not in encodings_try:
-                encodings_try.append(enc)
-
-        selected_enc: str | None = None
-        for enc in encodings_try:
+        # Encoding adivinado sobre un prefijo del archivo; si con él no se decodifica, no se
+        # parsea o no valida, se reintenta con los siguientes (latin1 nunca falla al decodificar)
+        selected_enc = _detectar_encoding(file_obj)
+        candidatos = _encodings_a_probar(selected_enc)
+        for enc in candidatos:
             try:
                 if hasattr(file_obj, "seek"):
                     file_obj.seek(0)
             except Exception:
                 pass
             try:
-                common_kwargs = dict(
-                    sep=cfg["sep"],
-                    decimal=cfg["decimal"],
-                    encoding=enc,
-                    engine="python",
-                    skip_blank_lines=True,
-                )
-                if banco == "supervielle":
-                    # Leer todo como texto para evitar inferencias erróneas
-                    candidate = pd.read_csv(
-                        file_obj,
-                        sep=cfg["sep"],
-                        decimal=cfg["decimal"],
-                        encoding=enc,
-                        engine="python",
-                        skip_blank_lines=True,
-                        dtype=str,
-                        keep_default_na=False,
-                    )
-                    # Renombrar columnas comunes a canónicas
-                    rename_map = {
-                        "D?bito": "Debito", "Débito": "Debito",
-                        "Cr?dito": "Credito", "Credito": "Credito",
-                        "Detalle": "Detalle", "Concepto": "Concepto",
-                        "Saldo": "Saldo", "Descripcion": "Descripcion",
-                    }
-                    candidate = candidate.rename(columns={c: rename_map.get(c, c) for c in candidate.columns})
-                else:
-                    candidate = pd.read_csv(file_obj, **common_kwargs)
-
-                # Fallback: si quedÃ³ una sola columna, intentar auto-detectar separador
-                if banco == "supervielle" and "Descripción" not in candidate.columns:
-                    idx = candidate.columns.get_loc("Detalle") + 1 if "Detalle" in candidate.columns else len(candidate.columns)
-                    candidate.insert(idx, "Descripción", pd.NA)
-                if candidate.shape[1] == 1:
-                    try:
-                        if hasattr(file_obj, "seek"):
-                            file_obj.seek(0)
-                    except Exception:
-                        pass
-                    try:
-                        autodetect = pd.read_csv(
-                            file_obj,
-                            sep=None,
-                            engine="python",
-                            encoding=enc,
-                            decimal=cfg["decimal"],
-                            skip_blank_lines=True,
-                            keep_default_na=False,
-                        )
-                        candidate = autodetect
-                    except Exception:
-                        pass
-                validar_columnas_tolerante(candidate, banco)
-                df = candidate
-                selected_enc = enc
-                break
-            except Exception as e:
-                last_err = e
+                df = _leer_csv_banco(file_obj, banco, cfg, enc)
+            except ValueError:  # incluye UnicodeDecodeError, pd.errors.ParserError y la validación
+                if enc == candidatos[-1]:
+                    raise
                 continue
-
-        if df is None:
-            raise last_err if last_err else ValueError(
-                f"No se pudo leer el CSV de {banco} con encodings comunes"
-            )
+            selected_enc = enc
+            break
 
     # Normalizar importes (incluye caso Supervielle forzando texto -> float)
     if banco == "supervielle":
@@ -612,32 +941,21 @@ def cargar_banco(path_or_file: Union[str, TextIO, BinaryIO]) -> Tuple[pd.DataFra
             # Releer como texto crudo para obtener los importes con coma
             if hasattr(file_obj, "seek"):
                 file_obj.seek(0)
-            raw_df = pd.read_csv(
-                file_obj,
-                sep=cfg["sep"],
-                encoding=selected_enc or cfg.get("encoding", "latin1"),
-                engine="python",
-                skip_blank_lines=True,
-                dtype=str,
-                keep_default_na=False,
+            raw_df = _read_csv(
+                file_obj, cfg["sep"], cfg["decimal"],
+                selected_enc or cfg.get("encoding", "latin1"), as_text=True,
+                columns=_SUPERVIELLE_IMPORTES,  # solo se parsean los importes
             )
         except Exception:
             raw_df = None
 
-        for c in ["Debito", "Credito", "Saldo"]:
+        # Las cabeceras crudas conservan acentos ("Débito"): se emparejan por clave normalizada
+        crudas = _keymap(tuple(raw_df.columns)) if raw_df is not None else {}
+        for c in _SUPERVIELLE_IMPORTES:
             if c in df.columns:
-                source_series = raw_df[c] if (raw_df is not None and c in raw_df.columns) else df[c]
-                s = source_series.astype(str).str.replace(".", "", regex=False)
-                s = s.str.replace(",", ".", regex=False)
-                df[c] = _to_float(s)
-
-    # Normalizar fecha
-    if "Fecha" in df.columns:
-        df["Fecha"] = pd.to_datetime(
-            df["Fecha"].astype(str).str.strip(),
-            format=cfg["fecha_format"],
-            errors="coerce",
-        )
+                cruda = crudas.get(_keyize(c))
+                source_series = raw_df[cruda] if cruda is not None else df[c]
+                df[c] = _to_float(source_series.astype(str).str.translate(_TRADUCCION_IMPORTE))
 
     # Normalizar importes con reglas por banco
     df = normalizar_importes(df, banco)
@@ -646,16 +964,20 @@ def cargar_banco(path_or_file: Union[str, TextIO, BinaryIO]) -> Tuple[pd.DataFra
     cfg = BANCOS[banco]
     df = _canonicalize_columns(df, cfg)
     df = _unificar_descripcion(df, cfg)
-    if "Fecha" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["Fecha"]):
-        fmt = cfg.get("fecha_format")
-        try:
-            df["Fecha"] = pd.to_datetime(
-                df["Fecha"].astype(str).str.strip(),
-                format=fmt if fmt else None,
-                errors="coerce",
-            )
-        except Exception:
-            df["Fecha"] = pd.to_datetime(df["Fecha"], errors="coerce")
+
+    # Normalizar fecha (una sola pasada, sobre la columna ya canÃ³nica)
+    if "Fecha" in df.columns:
+        df["Fecha"] = pd.to_datetime(
+            df["Fecha"].astype(str).str.strip(),
+            format=cfg["fecha_format"],
+            errors="coerce",
+            cache=True,
+        )
+
+    # Columnas de vocabulario chico (conceptos, cuentas): category en vez de texto repetido
+    for col in cfg.get("categoricas", []):
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
 
     return df, banco
 
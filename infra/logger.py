@@ -1,16 +1,13 @@
 import logging
-from typing import Optional
-
-
-_logger: Optional[logging.Logger] = None
 
 
 def get_logger(name: str = "conciliador") -> logging.Logger:
-    global _logger
-    if _logger is not None:
-        return _logger
-
+    # logging.getLogger ya devuelve la misma instancia por nombre; solo se configura
+    # la primera vez (si ya tiene handlers no se agregan duplicados en cada rerun)
     logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
     logger.setLevel(logging.INFO)
 
     ch = logging.StreamHandler()
@@ -19,5 +16,4 @@ def get_logger(name: str = "conciliador") -> logging.Logger:
     ch.setFormatter(fmt)
     logger.addHandler(ch)
 
-    _logger = logger
     return logger
@@ -3,9 +3,17 @@ from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Iterable
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import repeat
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
 import re
 import unicodedata
 
+import numpy as np
+
 from logic.modelos import Movimiento, Match
 from infra.loader_bancos import cargar_banco
 from infra.config import load_config
@@ -19,51 +27,83 @@ class Parametros:
     permitir_grupos_fuera_de_fecha: bool = False
     fecha_desde: date | None = None
     fecha_hasta: date | None = None
+    umbral_similitud_texto: float = 0.0  # >0 (p. ej. 0.85) activa el nivel "texto similar"; 0 = desactivado
+    procesos: int = 1  # >1 reparte las sugerencias por tolerancia entre procesos (archivos grandes)
+
+
+# Con menos movimientos de Banco pendientes el costo de levantar procesos supera lo que se gana
+_MIN_BANCO_PARALELO = 5000
 
+_RE_SEPARADOR_TOKENS = re.compile(r"[^0-9a-zA-Z]+")
 
-def _nums(texto: str) -> set[str]:
-    """Extrae todos los numeros de un texto como strings."""
-    return set(re.findall(r"\d+", texto or ""))
+# Vocales acentuadas, ñ y ç -> su letra base (lo mismo que daría NFKD sin marcas combinantes)
+_TABLA_ACENTOS = str.maketrans({
+    c: "".join(ch for ch in unicodedata.normalize("NFKD", c) if not unicodedata.combining(ch))
+    for c in "áàäâéèëêíìïîóòöôúùüûñçÁÀÄÂÉÈËÊÍÌÏÎÓÒÖÔÚÙÜÛÑÇ"
+})
 
 
+@lru_cache(maxsize=65536)
 def _strip_accents(text: str) -> str:
     if not isinstance(text, str):
         return str(text)
+    if text.isascii():
+        return text
+    text = text.translate(_TABLA_ACENTOS)
+    if text.isascii():  # caso habitual en castellano: NFKD no hace falta
+        return text
     normalized = unicodedata.normalize("NFKD", text)
     return "".join(ch for ch in normalized if not unicodedata.combining(ch))
 
 
 # Stopwords configurables desde config.yaml
 _CFG = load_config("config.yaml")
-_STOPWORDS = set(map(str.lower, (_CFG.conciliacion.stopwords or [])))
+_STOPWORDS = frozenset(map(str.lower, (_CFG.conciliacion.stopwords or [])))
 
 
-def tiene_match_textual(desc1: str, desc2: str) -> bool:
-    """True si hay al menos un token significativo en comun (palabra o numero).
+@lru_cache(maxsize=100_000)
+def _tokens(
+    texto: str,
+    _stopwords: frozenset[str] = _STOPWORDS,
+    _strip=_strip_accents,
+    _split=_RE_SEPARADOR_TOKENS.split,
+) -> frozenset[str]:
+    """Tokens significativos de una descripcion (palabras y numeros), memoizados por texto
+    para que los re-cálculos con otros Parametros no vuelvan a tokenizar.
 
     - Tokeniza por no alfanumerico
     - Normaliza a minusculas y sin tildes
     - Remueve stopwords y tokens de longitud 1
     """
-    def tokens(s: str) -> set[str]:
-        s = _strip_accents((s or "").lower())
-        toks = re.split(r"[^0-9a-zA-Z]+", s)
-        out = set()
-        for t in toks:
-            if not t:
-                continue
-            if len(t) <= 1:
-                continue
-            if t in _STOPWORDS:
-                continue
-            out.add(t)
-        return out
+    # Los globals se enlazan como argumentos por defecto (lookup local en el bucle de tokens)
+    return frozenset(t for t in _split(_strip((texto or "").lower())) if len(t) > 1 and t not in _stopwords)
+
+
+def _huella(tokens: frozenset[str]) -> int:
+    """Huella de 64 bits (filtro de Bloom de un hash por token): si dos huellas no comparten
+    bits, los conjuntos de tokens son disjuntos con certeza."""
+    h = 0
+    for t in tokens:
+        h |= 1 << (hash(t) & 63)
+    return h
+
 
-    t1, t2 = tokens(desc1), tokens(desc2)
-    if t1 & t2:
-        return True
-    # TODO: fuzzy matching (difflib / rapidfuzz) para coincidencia parcial
-    return False
+@lru_cache(maxsize=65536)
+def _texto_ordenado(texto: str) -> str:
+    """Tokens (sin tildes, minusculas) ordenados y unidos por espacio, para comparar por similitud."""
+    s = _strip_accents((texto or "").lower())
+    return " ".join(sorted(t for t in _RE_SEPARADOR_TOKENS.split(s) if t))
+
+
+def similitud_texto(desc1: str, desc2: str) -> float:
+    """Similitud 0..1 entre descripciones con tokens ordenados (token_sort_ratio sobre difflib).
+
+    Tolera variantes y palabras reordenadas: "HONORARIOS CONTADOR" ~ "CONTADORA HONORARIO".
+    """
+    a, b = _texto_ordenado(desc1), _texto_ordenado(desc2)
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
 
 
 def _key_base(m: Movimiento) -> tuple:
@@ -71,13 +111,17 @@ def _key_base(m: Movimiento) -> tuple:
     return (m.fecha, round(m.importe, 2))
 
 
+def _marcar_consumidos(consumido: np.ndarray, posiciones: np.ndarray, usados: set[int]) -> None:
+    """Marca como consumidas las posiciones (relativas a la lista de pendientes) usadas por una fase."""
+    consumido[posiciones[np.fromiter(usados, dtype=np.intp, count=len(usados))]] = True
+
+
 def conciliar(
     banco: list[Movimiento],
     interno: list[Movimiento],
     params: Parametros = Parametros(),
 ) -> tuple[list[Match], list[Movimiento], list[Movimiento]]:
     matches: list[Match] = []
-    consumidos_b, consumidos_i = set(), set()
 
     # --- Filtrar por rango de fechas si corresponde ---
     if params.fecha_desde or params.fecha_hasta:
@@ -88,59 +132,90 @@ def conciliar(
                    (params.fecha_desde is None or m.fecha >= params.fecha_desde) and
                    (params.fecha_hasta is None or m.fecha <= params.fecha_hasta)]
 
-    # Indice multivaluado por clave base (fechaimporte)
+    # Consumo por posición en banco/interno (máscaras booleanas)
+    consumido_b = np.zeros(len(banco), dtype=bool)
+    consumido_i = np.zeros(len(interno), dtype=bool)
+
+    # Indice multivaluado por clave base (fechaimporte) -> [(posición, movimiento)]
     idx_i = defaultdict(list)
-    for m in interno:
-        idx_i[_key_base(m)].append(m)
+    for k, m in enumerate(interno):
+        idx_i[_key_base(m)].append((k, m))
+
+    # Tokens (y su huella) de cada descripcion de Interno, una sola vez (no por par comparado)
+    tokens_i = [_tokens(m.descripcion) for m in interno]
+    huellas_i = [_huella(t) for t in tokens_i]
 
     # --- Conciliacion exacta (consumo de a uno, requiere texto en comun) ---
-    for b in banco:
-        kb = _key_base(b)
-        if kb in idx_i:
-            candidatos = [i for i in idx_i[kb] if id(i) not in consumidos_i]
-            if not candidatos:
-                continue
-            # intentar emparejar el primero que tenga match textual
-            i_match = None
-            for i in candidatos:
-                if tiene_match_textual(b.descripcion, i.descripcion):
-                    i_match = i
-                    estado, corr = "Conciliado exacto", "Coincidencia por fecha/importe y texto"
-                    break
+    # Cada bucket contiene solo internos sin consumir: al aparear se quita del bucket.
+    for kb, b in enumerate(banco):
+        candidatos = idx_i.get(_key_base(b))
+        if not candidatos:
+            continue
+        # intentar emparejar el primero que tenga match textual
+        tokens_b = _tokens(b.descripcion)
+        huella_b = _huella(tokens_b)
+        # La huella descarta con un AND la mayoría de los pares sin texto en común
+        pos = next(
+            (j for j, (ki, _) in enumerate(candidatos)
+             if huella_b & huellas_i[ki] and not tokens_b.isdisjoint(tokens_i[ki])),
+            None,
+        )
+        if pos is not None:
+            estado, corr = "Conciliado exacto", "Coincidencia por fecha/importe y texto"
+        elif params.umbral_similitud_texto > 0 and (pos := next(
+            (j for j, (_, i) in enumerate(candidatos)
+             if similitud_texto(b.descripcion, i.descripcion) >= params.umbral_similitud_texto),
+            None,
+        )) is not None:
+            estado, corr = "Conciliado (texto similar)", "Coincidencia por fecha/importe y texto similar"
+        else:
             # si no hubo texto en común, usar el primero como sugerido
-            if not i_match:
-                i_match = candidatos[0]
-                estado, corr = "Sugerido (importe+fecha sin texto)", "Revisar: coincide importe y fecha pero no texto"
-
-            matches.append(Match(
-                fecha_banco=b.fecha,
-                importe_banco=b.importe,
-                desc_banco=b.descripcion,
-                fecha_interno=i_match.fecha,
-                importe_interno=i_match.importe,
-                desc_interno=i_match.descripcion,
-                estado=estado,
-                correccion_sugerida=corr,
-            ))
-            consumidos_b.add(id(b))
-            consumidos_i.add(id(i_match))
+            pos = 0
+            estado, corr = "Sugerido (importe+fecha sin texto)", "Revisar: coincide importe y fecha pero no texto"
+        ki, i_match = candidatos.pop(pos)
+
+        matches.append(Match(
+            fecha_banco=b.fecha,
+            importe_banco=b.importe,
+            desc_banco=b.descripcion,
+            fecha_interno=i_match.fecha,
+            importe_interno=i_match.importe,
+            desc_interno=i_match.descripcion,
+            estado=estado,
+            correccion_sugerida=corr,
+        ))
+        consumido_b[kb] = True
+        consumido_i[ki] = True
 
     # --- Pendientes ---
-    pendientes_b = [m for m in banco if id(m) not in consumidos_b]
-    pendientes_i = [m for m in interno if id(m) not in consumidos_i]
+    pos_b = np.flatnonzero(~consumido_b)
+    pos_i = np.flatnonzero(~consumido_i)
+    pendientes_b = [banco[k] for k in pos_b]
+    pendientes_i = [interno[k] for k in pos_i]
 
     # --- Sugerencias por tolerancia ---
     if params.tolerancia_importe > 0 or params.tolerancia_dias > 0:
-        matches.extend(
-            sugerencias_por_tolerancia(pendientes_b, pendientes_i,
-                                       params.tolerancia_importe,
-                                       params.tolerancia_dias)
-        )
+        if params.procesos > 1 and len(pendientes_b) >= _MIN_BANCO_PARALELO:
+            mt, usados_b, usados_i = _sugerencias_en_paralelo(
+                pendientes_b, pendientes_i,
+                params.tolerancia_importe,
+                params.tolerancia_dias,
+                params.procesos,
+            )
+        else:
+            mt, usados_b, usados_i = sugerencias_por_tolerancia(
+                pendientes_b, pendientes_i,
+                params.tolerancia_importe,
+                params.tolerancia_dias,
+            )
+        matches.extend(mt)
+        _marcar_consumidos(consumido_b, pos_b, usados_b)
+        _marcar_consumidos(consumido_i, pos_i, usados_i)
 
     # --- Conciliacion grupal ---
     if params.permitir_conciliacion_grupal:
         # Fase 1: mismo día
-        mg = conciliacion_grupal(
+        mg, usados_b, usados_i = conciliacion_grupal(
             pendientes_b, pendientes_i,
             params.tolerancia_importe,
             params.tolerancia_dias,
@@ -148,28 +223,20 @@ def conciliar(
         )
         if not mg and params.permitir_grupos_fuera_de_fecha:
             # Fase 2: permitir cruces por tolerancia de días
-            mg = conciliacion_grupal(
+            mg, usados_b, usados_i = conciliacion_grupal(
                 pendientes_b, pendientes_i,
                 params.tolerancia_importe,
                 params.tolerancia_dias,
                 True,
             )
         matches.extend(mg)
+        # Los movimientos de un grupo sugerido dejan de figurar como pendientes
+        _marcar_consumidos(consumido_b, pos_b, usados_b)
+        _marcar_consumidos(consumido_i, pos_i, usados_i)
 
     # --- Recalcular pendientes despues de matches adicionales ---
-    usados_b = {(m.fecha_banco, m.importe_banco, m.desc_banco) for m in matches}
-    usados_i = {(m.fecha_interno, m.importe_interno, m.desc_interno) for m in matches}
-
-    pendientes_b = [m for m in pendientes_b if (m.fecha, m.importe, m.descripcion) not in usados_b]
-    pendientes_i = [m for m in pendientes_i if (m.fecha, m.importe, m.descripcion) not in usados_i]
-
-    # Consumir movimientos de fechas agrupadas (para evitar que sigan apareciendo como pendientes)
-    fechas_grupo_b = {m.fecha_banco for m in matches if str(m.estado).startswith("Sugerido (grupal)")}
-    fechas_grupo_i = {m.fecha_interno for m in matches if str(m.estado).startswith("Sugerido (grupal)")}
-    if fechas_grupo_b:
-        pendientes_b = [m for m in pendientes_b if m.fecha not in fechas_grupo_b]
-    if fechas_grupo_i:
-        pendientes_i = [m for m in pendientes_i if m.fecha not in fechas_grupo_i]
+    pendientes_b = [banco[k] for k in np.flatnonzero(~consumido_b)]
+    pendientes_i = [interno[k] for k in np.flatnonzero(~consumido_i)]
 
     return matches, pendientes_b, pendientes_i
 
@@ -179,41 +246,105 @@ def sugerencias_por_tolerancia(
     pendientes_i: Iterable[Movimiento],
     tolerancia_importe: float,
     tolerancia_dias: int,
-) -> list[Match]:
-    """Sugiere coincidencias basadas en tolerancias de fecha e importe."""
-    idx_i_fecha = defaultdict(list)
-    for m in pendientes_i:
-        idx_i_fecha[m.fecha].append(m)
+) -> tuple[list[Match], set[int], set[int]]:
+    """Sugiere coincidencias basadas en tolerancias de fecha e importe.
+
+    Devuelve (matches, posiciones de Banco usadas, posiciones de Interno usadas),
+    relativas al orden de `pendientes_b` / `pendientes_i`.
+    """
+    # Índice fecha -> (importes ordenados, [(posición, movimiento)] en el mismo orden):
+    # el rango de importes de cada Banco se obtiene por bisect, sin recorrer el día entero.
+    por_fecha_i: dict[date, list[tuple[float, int, Movimiento]]] = defaultdict(list)
+    for pos, m in enumerate(pendientes_i):
+        por_fecha_i[m.fecha].append((m.importe, pos, m))
+    idx_i: dict[date, tuple[list[float], list[tuple[int, Movimiento]]]] = {}
+    for d, filas in por_fecha_i.items():
+        filas.sort(key=itemgetter(0, 1))
+        idx_i[d] = ([imp for imp, _, _ in filas], [(pos, m) for _, pos, m in filas])
 
     out: list[Match] = []
-    for b in pendientes_b:
-        fmin = b.fecha - timedelta(days=tolerancia_dias)
-        fmax = b.fecha + timedelta(days=tolerancia_dias)
-
-        candidatos: list[Movimiento] = []
-        for d in (fmin + timedelta(days=k) for k in range((fmax - fmin).days + 1)):
-            candidatos.extend(idx_i_fecha.get(d, []))
-
-        # Ventana de importes
-        candidatos = [c for c in candidatos if abs(c.importe - b.importe) <= tolerancia_importe]
-
-        for i in candidatos:
-            nb, ni = _nums(b.descripcion), _nums(i.descripcion)
-            if nb & ni:
-                estado, corr = "Sugerido (descripción)", "Coincidencia por número en descripción"
-            else:
-                estado, corr = "Sugerido (tolerancias)", "Revisar manual (dentro de tolerancias)"
-            out.append(Match(
-                fecha_banco=b.fecha,
-                importe_banco=b.importe,
-                desc_banco=b.descripcion,
-                fecha_interno=i.fecha,
-                importe_interno=i.importe,
-                desc_interno=i.descripcion,
-                estado=estado,
-                correccion_sugerida=corr,
-            ))
-    return out
+    usados_b: set[int] = set()
+    usados_i: set[int] = set()
+    if not idx_i:
+        return out, usados_b, usados_i
+
+    # Fechas de Interno ordenadas: la ventana de cada Banco se acota por bisect y solo se
+    # recorren días que existen (sin generar fechas vacías de la ventana)
+    fechas_i = sorted(idx_i)
+    ventana = timedelta(days=tolerancia_dias)
+
+    for kb, b in enumerate(pendientes_b):
+        # Margen mínimo por redondeo de punto flotante; el filtro exacto es el abs() de abajo
+        holgura = tolerancia_importe + abs(b.importe) * 1e-12 + 1e-12
+        if tolerancia_dias == 0:
+            dias = (b.fecha,)
+        else:
+            dias = fechas_i[bisect_left(fechas_i, b.fecha - ventana):bisect_right(fechas_i, b.fecha + ventana)]
+        for d in dias:
+            entrada = idx_i.get(d)
+            if entrada is None:
+                continue
+            importes, movs = entrada
+            lo = bisect_left(importes, b.importe - holgura)
+            hi = bisect_right(importes, b.importe + holgura)
+            if lo == hi:
+                continue
+            # Mantener el orden original de Interno dentro del día
+            candidatos = sorted(movs[lo:hi], key=itemgetter(0)) if hi - lo > 1 else movs[lo:hi]
+
+            for ki, i in candidatos:
+                # Ventana de importes
+                if abs(i.importe - b.importe) > tolerancia_importe:
+                    continue
+                if not b.nums.isdisjoint(i.nums):
+                    estado, corr = "Sugerido (descripción)", "Coincidencia por número en descripción"
+                else:
+                    estado, corr = "Sugerido (tolerancias)", "Revisar manual (dentro de tolerancias)"
+                out.append(Match(
+                    fecha_banco=b.fecha,
+                    importe_banco=b.importe,
+                    desc_banco=b.descripcion,
+                    fecha_interno=i.fecha,
+                    importe_interno=i.importe,
+                    desc_interno=i.descripcion,
+                    estado=estado,
+                    correccion_sugerida=corr,
+                ))
+                usados_b.add(kb)
+                usados_i.add(ki)
+    return out, usados_b, usados_i
+
+
+
+def _sugerencias_en_paralelo(
+    pendientes_b: list[Movimiento],
+    pendientes_i: list[Movimiento],
+    tolerancia_importe: float,
+    tolerancia_dias: int,
+    procesos: int,
+) -> tuple[list[Match], set[int], set[int]]:
+    """Reparte Banco en bloques contiguos entre procesos; el resultado es el mismo que en serie.
+
+    Cada Banco solo mira Interno dentro de su ventana, así que los bloques son independientes.
+    Las posiciones de Banco de cada bloque se desplazan a su inicio en `pendientes_b`.
+    """
+    tam = max(1, -(-len(pendientes_b) // procesos))
+    inicios = range(0, len(pendientes_b), tam)
+    bloques = [pendientes_b[k:k + tam] for k in inicios]
+
+    out: list[Match] = []
+    usados_b: set[int] = set()
+    usados_i: set[int] = set()
+    with ProcessPoolExecutor(max_workers=procesos) as ex:
+        resultados = ex.map(
+            sugerencias_por_tolerancia,
+            bloques, repeat(pendientes_i), repeat(tolerancia_importe), repeat(tolerancia_dias),
+        )
+        for inicio, (mt, ub, ui) in zip(inicios, resultados):
+            out.extend(mt)
+            usados_b.update(inicio + k for k in ub)
+            usados_i |= ui
+    return out, usados_b, usados_i
 
 
 def conciliacion_grupal(
@@ -222,51 +353,76 @@ def conciliacion_grupal(
     tolerancia_importe: float,
     tolerancia_dias: int,
     permitir_fuera_fecha: bool,
-) -> list[Match]:
-    """Conciliación grupal: compara sumas de movimientos de un mismo día contra sumas del otro origen."""
+) -> tuple[list[Match], set[int], set[int]]:
+    """Conciliación grupal: compara sumas de movimientos de un mismo día contra sumas del otro origen.
+
+    Devuelve (matches, posiciones de Banco agrupadas, posiciones de Interno agrupadas),
+    relativas al orden de `pendientes_b` / `pendientes_i`.
+    """
     out: list[Match] = []
+    usados_b: set[int] = set()
+    usados_i: set[int] = set()
 
     # Agrupar por fecha
     grupos_b = defaultdict(list)
     grupos_i = defaultdict(list)
-    for m in pendientes_b:
+    posiciones_b = defaultdict(list)
+    posiciones_i = defaultdict(list)
+    for k, m in enumerate(pendientes_b):
         grupos_b[m.fecha].append(m)
-    for m in pendientes_i:
+        posiciones_b[m.fecha].append(k)
+    for k, m in enumerate(pendientes_i):
         grupos_i[m.fecha].append(m)
+        posiciones_i[m.fecha].append(k)
+
+    # Sumas por fecha de Interno (una vez) y fechas ordenadas para buscar la ventana por bisección.
+    # En paralelo a fechas_i: sumas (float64) y orden de aparición, para filtrar la ventana en numpy.
+    sumas_i = {fi: sum(m.importe for m in grupo_i) for fi, grupo_i in grupos_i.items()}
+    orden_i = {fi: k for k, fi in enumerate(grupos_i)}
+    fechas_i = sorted(grupos_i)
+    sumas_ord = np.array([sumas_i[fi] for fi in fechas_i], dtype=np.float64)
+    orden_ord = np.array([orden_i[fi] for fi in fechas_i], dtype=np.intp)
+    ventana = timedelta(days=tolerancia_dias)
 
     for fb, grupo_b in grupos_b.items():
         suma_b = sum(m.importe for m in grupo_b)
 
-        for fi, grupo_i in grupos_i.items():
-            suma_i = sum(m.importe for m in grupo_i)
-
-            # Condición de fechas
-            fechas_ok = (fb == fi) or (
-                permitir_fuera_fecha and abs((fb - fi).days) <= tolerancia_dias
-            )
-
-            # Condición de importes
-            importes_ok = abs(suma_b - suma_i) <= tolerancia_importe
-
-            if fechas_ok and importes_ok:
-                desc_b = "; ".join(m.descripcion for m in grupo_b[:3])
-                desc_i = "; ".join(m.descripcion for m in grupo_i[:3])
-
-                # Evitar grupos 1 a 1 (ya cubiertos por otras reglas)
-                if len(grupo_b) == 1 and len(grupo_i) == 1:
-                    continue
+        # Condición de fechas: mismo día, o |fb - fi| <= tolerancia si se permite fuera de fecha;
+        # condición de importes: |suma_b - suma_i| <= tolerancia (vectorizada sobre la ventana)
+        if permitir_fuera_fecha and tolerancia_dias > 0:
+            lo = bisect_left(fechas_i, fb - ventana)
+            hi = bisect_right(fechas_i, fb + ventana)
+            ok = lo + np.flatnonzero(np.abs(sumas_ord[lo:hi] - suma_b) <= tolerancia_importe)
+            ok = ok[np.argsort(orden_ord[ok], kind="stable")]
+            candidatas = [fechas_i[k] for k in ok]
+        elif fb in grupos_i and abs(suma_b - sumas_i[fb]) <= tolerancia_importe:
+            candidatas = [fb]
+        else:
+            candidatas = []
+
+        for fi in candidatas:
+            grupo_i = grupos_i[fi]
+            suma_i = sumas_i[fi]
+            desc_b = "; ".join(m.descripcion for m in grupo_b[:3])
+            desc_i = "; ".join(m.descripcion for m in grupo_i[:3])
+
+            # Evitar grupos 1 a 1 (ya cubiertos por otras reglas)
+            if len(grupo_b) == 1 and len(grupo_i) == 1:
+                continue
 
-                out.append(Match(
-                    fecha_banco=fb,
-                    importe_banco=suma_b,
-                    desc_banco=f"[Grupo {len(grupo_b)} movs] {desc_b}...",
-                    fecha_interno=fi,
-                    importe_interno=suma_i,
-                    desc_interno=f"[Grupo {len(grupo_i)} movs] {desc_i}...",
-                    estado="Sugerido (grupal)",
-                    correccion_sugerida="Revisar suma de movimientos (grupo)",
-                ))
-    return out
+            out.append(Match(
+                fecha_banco=fb,
+                importe_banco=suma_b,
+                desc_banco=f"[Grupo {len(grupo_b)} movs] {desc_b}...",
+                fecha_interno=fi,
+                importe_interno=suma_i,
+                desc_interno=f"[Grupo {len(grupo_i)} movs] {desc_i}...",
+                estado="Sugerido (grupal)",
+                correccion_sugerida="Revisar suma de movimientos (grupo)",
+            ))
+            usados_b.update(posiciones_b[fb])
+            usados_i.update(posiciones_i[fi])
+    return out, usados_b, usados_i
 
 
 # ==========================================================
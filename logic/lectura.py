@@ -1,62 +1,91 @@
 from __future__ import annotations
 
 import math
+import re
+import sys
 import unicodedata
+from functools import lru_cache
 from numbers import Integral, Real
+from typing import NamedTuple
 
+import numpy as np
 import pandas as pd
 
 from logic.modelos import Movimiento, Origen
 
 
+_REEMPLAZOS_ENCABEZADO = {
+    "cr?dito": "credito",
+    "crÃ©dito": "credito",
+    "crÃ©ditos": "creditos",
+    "cr�dito": "credito",
+    "d?bito": "debito",
+    "dÃ©bito": "debito",
+    "dÃ©bitos": "debitos",
+    "d�bito": "debito",
+}
+_RE_REEMPLAZOS_ENCABEZADO = re.compile("|".join(map(re.escape, _REEMPLAZOS_ENCABEZADO)))
+
+
+@lru_cache(maxsize=65536)
 def _sanitize_header(value: str) -> str:
-    lowered = str(value).lower()
-    replacements = {
-        "cr?dito": "credito",
-        "crÃ©dito": "credito",
-        "crÃ©ditos": "creditos",
-        "cr�dito": "credito",
-        "d?bito": "debito",
-        "dÃ©bito": "debito",
-        "dÃ©bitos": "debitos",
-        "d�bito": "debito",
-    }
-    for wrong, corrected in replacements.items():
-        if wrong in lowered:
-            lowered = lowered.replace(wrong, corrected)
+    lowered = _RE_REEMPLAZOS_ENCABEZADO.sub(
+        lambda m: _REEMPLAZOS_ENCABEZADO[m.group(0)], str(value).lower()
+    )
     normalized = unicodedata.normalize("NFKD", lowered)
     return "".join(ch for ch in normalized if not unicodedata.combining(ch))
 
 
+def _variantes(keywords: tuple[str, ...]) -> tuple[tuple[str, ...], ...]:
+    """Por palabra clave: sus formas en minúsculas y saneada (sin repetir)."""
+    return tuple(tuple(dict.fromkeys((kw.lower(), _sanitize_header(kw)))) for kw in keywords)
+
+
+# Palabras clave de cada columna, ya en minúsculas/saneadas (constantes: se calculan al importar)
+_CLAVES_FECHA = _variantes(("fecha",))
+_CLAVES_IMPORTE = _variantes(("importe", "monto"))
+_CLAVES_DEBITO = _variantes(("debito", "salida"))
+_CLAVES_CREDITO = _variantes(("credito", "entrada"))
+_CLAVES_DESCRIPCION = _variantes((
+    "detalle", "descrip", "concepto", "leyenda", "observac",
+    "referen", "glosa", "coment", "n�", "n°", "nro", "numero"
+))
+
+
 def detectar_columnas(df: pd.DataFrame) -> tuple[str | None, str | None, str | None, str | None, str | None]:
-    cols = list(df.columns)
+    # Solo depende de los nombres de columna: se memoiza por la tupla de encabezados
+    return _detectar_columnas(tuple(df.columns))
+
+
+@lru_cache(maxsize=64)
+def _detectar_columnas(cols: tuple) -> tuple[str | None, str | None, str | None, str | None, str | None]:
     lower = [str(c).lower() for c in cols]
     sanitized = [_sanitize_header(c) for c in cols]
 
-    def pick(keywords):
-        for kw in keywords:
-            kw_lower = kw.lower()
-            kw_sanitized = _sanitize_header(kw)
+    def pick(claves):
+        for variantes in claves:
             for original, raw, clean in zip(cols, lower, sanitized):
-                if (
-                    kw_lower in raw
-                    or kw_lower in clean
-                    or kw_sanitized in raw
-                    or kw_sanitized in clean
-                ):
+                if any(v in raw or v in clean for v in variantes):
                     return original
         return None
 
-    f = pick(["fecha"])  # Fecha
-    i = pick(["importe", "monto"])  # Importe único
-    d = pick(["debito", "salida"])  # Débito
-    c = pick(["credito", "entrada"])  # Crédito
-    desc = pick([
-        "detalle", "descrip", "concepto", "leyenda", "observac",
-        "referen", "glosa", "coment", "n�", "n°", "nro", "numero"
-    ])
+    f = pick(_CLAVES_FECHA)  # Fecha
+    i = pick(_CLAVES_IMPORTE)  # Importe único
+    d = pick(_CLAVES_DEBITO)  # Débito
+    c = pick(_CLAVES_CREDITO)  # Crédito
+    desc = pick(_CLAVES_DESCRIPCION)
     return f, i, d, c, desc
 
+_PALABRAS_ENCABEZADO = (
+    "fecha", "importe", "monto",
+    "debito", "débito",
+    "credito", "crédito",
+    "concepto", "desc", "detalle",
+    "nro", "numero"
+)
+_RE_PALABRAS_ENCABEZADO = "|".join(map(re.escape, _PALABRAS_ENCABEZADO))
+
+
 def detectar_encabezado(df: pd.DataFrame, tope: int = 10) -> int:
     """
     Detecta la fila que más probablemente corresponde al encabezado de un Excel
@@ -74,28 +103,69 @@ def detectar_encabezado(df: pd.DataFrame, tope: int = 10) -> int:
     int
         Índice de la fila que se usará como encabezado.
     """
-    palabras = [
-        "fecha", "importe", "monto",
-        "debito", "débito",
-        "credito", "crédito",
-        "concepto", "desc", "detalle",
-        "nro", "numero"
-    ]
-    fila_header, max_matches = 0, 0
-    tope = min(tope, len(df))
+    cabeza = df.head(tope)
+    if cabeza.empty:
+        return 0
+    # Todas las celdas en una sola serie: lower + búsqueda de palabras clave en una pasada;
+    # las celdas vacías (None/NaN) no cuentan
+    celdas = pd.Series(cabeza.to_numpy(dtype=object).ravel(), dtype="string")
+    coincide = celdas.str.lower().str.contains(_RE_PALABRAS_ENCABEZADO, na=False)
+    por_fila = coincide.to_numpy(dtype=bool).reshape(cabeza.shape).sum(axis=1)
+    # argmax devuelve la primera fila con más coincidencias (0 si ninguna coincide)
+    return int(por_fila.argmax())
+
+# Formatos de fecha habituales en extractos y reportes (se prueban en este orden)
+_FORMATOS_FECHA = (
+    "%d/%m/%Y",
+    "%Y-%m-%d",
+    "%d-%m-%Y",
+    "%d/%m/%y",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+)
 
-    for i in range(tope):
-        fila = df.iloc[i].astype(str).str.lower()
-        matches = sum(any(p in val for p in palabras) for val in fila)
-        if matches > max_matches:
-            max_matches, fila_header = matches, i
 
-    return fila_header
+def detectar_formato_fecha(serie: pd.Series, muestra: int = 20) -> str | None:
+    """Devuelve el formato de `_FORMATOS_FECHA` que parsea más valores de la muestra.
+
+    Se exige que parsee más de la mitad (tolera filas sueltas como "Saldo anterior");
+    ante empate gana el primero de la lista (día primero).
+    """
+    valores = serie.dropna().astype(str).str.strip().head(muestra)
+    if valores.empty:
+        return None
+    aciertos = {
+        fmt: int(pd.to_datetime(valores, format=fmt, errors="coerce").notna().sum())
+        for fmt in _FORMATOS_FECHA
+    }
+    fmt = max(aciertos, key=aciertos.get)
+    return fmt if aciertos[fmt] * 2 > len(valores) else None
+
+
+def parsear_fechas(serie: pd.Series) -> pd.Series:
+    """Convierte a datetime con un formato detectado sobre una muestra (parseo vectorizado).
+
+    Si la columna ya es datetime se devuelve tal cual; si no se reconoce el formato se
+    cae a la inferencia de pandas.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    fmt = detectar_formato_fecha(serie)
+    if fmt is None:
+        return pd.to_datetime(serie, errors="coerce", cache=True)
+    return pd.to_datetime(serie.astype(str).str.strip(), format=fmt, errors="coerce", cache=True)
+
+
+_PATRON_NO_NUMERICO = r"[^0-9,.\-]"
+
 
 def limpiar_importe_serie(serie: pd.Series) -> pd.Series:
+    # Columnas ya numéricas (típico de Excel): sin ida y vuelta por texto; ±inf -> NaN como antes
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return pd.to_numeric(serie, errors="coerce").replace([math.inf, -math.inf], math.nan)
     return pd.to_numeric(
         serie.astype(str)
-        .str.replace(r"[^0-9,.\-]", "", regex=True)
+        .str.replace(_PATRON_NO_NUMERICO, "", regex=True)
         .str.replace(",", ".", regex=False),
         errors="coerce"
     )
@@ -136,6 +206,22 @@ def _normalizar_descripcion(valor) -> str:
 
 def normalizar_columna_descripcion(serie: pd.Series) -> pd.Series:
     """Normaliza una serie de descripciones garantizando representación textual uniforme."""
+    # Columnas homogéneas (texto, enteros o reales) se resuelven por columna; mezclas, elemento a elemento
+    if isinstance(serie.dtype, pd.StringDtype):
+        return serie.fillna("").astype(str)
+    if not isinstance(serie.dtype, np.dtype):
+        return serie.map(_normalizar_descripcion)
+    if serie.dtype.kind in "iu":
+        return serie.astype(str)
+    if serie.dtype.kind == "f":
+        valores = serie.to_numpy()
+        nulos = np.isnan(valores)
+        enteros = np.isfinite(valores) & (np.floor(valores) == valores) & (np.abs(valores) < 2.0**63)
+        textos = np.full(len(valores), "", dtype=object)
+        textos[enteros] = valores[enteros].astype(np.int64).astype(str)
+        resto = ~(enteros | nulos)
+        textos[resto] = [_normalizar_descripcion(v) for v in valores[resto]]
+        return pd.Series(textos, index=serie.index, name=serie.name, dtype=str)
     return serie.map(_normalizar_descripcion)
 
 
@@ -147,32 +233,47 @@ def normalizar_df(
     origen: Origen,
     meta: str
 ) -> list[Movimiento]:
-    df = df_raw.copy()
-    df[fecha_col] = pd.to_datetime(df[fecha_col], errors="coerce").dt.floor("d")
-    if desc_col and desc_col in df.columns:
-        desc_vals = normalizar_columna_descripcion(df[desc_col])
+    fechas = parsear_fechas(df_raw[fecha_col]).dt.floor("d")
+    if desc_col and desc_col in df_raw.columns:
+        desc_vals = normalizar_columna_descripcion(df_raw[desc_col])
     else:
-        desc_vals = pd.Series([""] * len(df), index=df.index)
-
-    out: list[Movimiento] = []
-    for f, imp, d in zip(df[fecha_col], importe_final, desc_vals):
-        if pd.isna(f) or pd.isna(imp) or float(imp) == 0.0:
-            continue
-        out.append(Movimiento(
-            fecha=f.date(),
-            importe=float(imp),
-            descripcion=str(d) if d is not None else "",
+        desc_vals = pd.Series([""] * len(df_raw), index=df_raw.index)
+
+    # Filtro por columna (fecha válida, importe no nulo y distinto de 0); el bucle solo construye.
+    # Las descripciones se internan: las repetidas comparten instancia (y aciertan los caches por texto)
+    importes = pd.Series(importe_final).to_numpy(dtype=float, na_value=np.nan)
+    mask = fechas.notna().to_numpy() & ~np.isnan(importes) & (importes != 0.0)
+    return [
+        Movimiento(
+            fecha=f,
+            importe=imp,
+            descripcion=sys.intern(str(d)) if d is not None else "",
             origen=origen,
             meta_origen=meta,
-        ))
-    return out
+        )
+        for f, imp, d in zip(
+            fechas[mask].dt.date.to_numpy(),
+            importes[mask].tolist(),
+            desc_vals.to_numpy()[mask],
+        )
+    ]
+
+
+class ModoCols(NamedTuple):
+    """Resultado de detectar_modo; sigue siendo una tupla (se puede desempaquetar como antes)."""
+    modo: str | None
+    fecha: str | None
+    importe: str | None
+    debito: str | None
+    credito: str | None
+    descripcion: str | None
 
 
-def detectar_modo(df: pd.DataFrame) -> tuple[str | None, str | None, str | None, str | None, str | None, str | None]:
+def detectar_modo(df: pd.DataFrame) -> ModoCols:
     """Devuelve (modo, fecha, importe, debito, credito, descripcion) con modo en {"Importe único", "Débito/Crédito", None}."""
     f, i, d, c, desc = detectar_columnas(df)
     if d and c:
-        return "Débito/Crédito", f, i, d, c, desc
+        return ModoCols("Débito/Crédito", f, i, d, c, desc)
     if i:
-        return "Importe único", f, i, None, None, desc
-    return None, f, i, d, c, desc
+        return ModoCols("Importe único", f, i, None, None, desc)
+    return ModoCols(None, f, i, d, c, desc)
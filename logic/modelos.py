@@ -1,22 +1,49 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
 from typing import Literal
 
 
 Origen = Literal["Banco", "Interno"]
 
+# Vocabulario de estados de la tabla de salida (orden: conciliados, sugeridos, no conciliados)
+ESTADOS: tuple[str, ...] = (
+    "Conciliado exacto",
+    "Conciliado (texto similar)",
+    "Sugerido (importe+fecha sin texto)",
+    "Sugerido (descripción)",
+    "Sugerido (tolerancias)",
+    "Sugerido (grupal)",
+    "No conciliado (solo Banco)",
+    "No conciliado (solo Interno)",
+)
 
-@dataclass(frozen=True)
+_RE_DIGITOS = re.compile(r"\d+")
+
+
+@lru_cache(maxsize=65536)
+def _nums(texto: str) -> frozenset[str]:
+    """Extrae todos los numeros de un texto como strings (memoizado por texto)."""
+    return frozenset(_RE_DIGITOS.findall(texto or ""))
+
+
+@dataclass(frozen=True, slots=True)
 class Movimiento:
     fecha: date          # fecha normalizada (día)
     importe: float       # importe final (único o C - D)
     descripcion: str     # texto libre
     origen: Origen       # "Banco" o "Interno"
     meta_origen: str = ""  # nombre de archivo/hoja opcional
+    # Números de la descripción, calculados una vez al construir (no participa de ==/hash)
+    nums: frozenset[str] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "nums", _nums(self.descripcion))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Match:
     fecha_banco: date
     importe_banco: float
@@ -0,0 +1,41 @@
+import io
+
+import pytest
+
+from infra.loader_bancos import BANCOS, _keyize, cargar_banco
+from tests.muestras import MUESTRAS_POR_BANCO
+
+
+@pytest.fixture(scope="session")
+def canonical_keys():
+    """Claves normalizadas de las columnas canónicas de cada banco (una vez por sesión)."""
+    return {banco: tuple(map(_keyize, cfg["cols"])) for banco, cfg in BANCOS.items()}
+
+
+@pytest.fixture(scope="session")
+def cargado():
+    """cargar_banco memoizado por contenido: cada CSV de prueba se parsea una sola vez por sesión.
+
+    Devuelve una copia del DataFrame para que un test que lo modifique no afecte a los demás.
+    """
+    cache = {}
+
+    def _cargar(data: str):
+        if data not in cache:
+            cache[data] = cargar_banco(io.StringIO(data))
+        df, banco = cache[data]
+        return df.copy(), banco
+
+    return _cargar
+
+
+@pytest.fixture(scope="session")
+def sample_files_by_bank(tmp_path_factory):
+    """Un CSV de ejemplo en disco por banco (columnas canónicas), escrito una vez por sesión."""
+    carpeta = tmp_path_factory.mktemp("extractos")
+    archivos = {}
+    for banco, data in MUESTRAS_POR_BANCO.items():
+        path = carpeta / f"{banco}.csv"
+        path.write_text(data, encoding="utf-8")
+        archivos[banco] = str(path)
+    return archivos
@@ -0,0 +1,29 @@
+"""Extractos de ejemplo (una fila) de cada banco, compartidos por los tests y sus fixtures."""
+
+GALICIA_CSV = '''"Fecha";"Descripción";"Origen";"Débitos";"Créditos";"Grupo de Conceptos";"Concepto";"Número de Terminal";"Observaciones Cliente";"Número de Comprobante";"Leyendas Adicionales1";"Leyendas Adicionales2";"Leyendas Adicionales3";"Leyendas Adicionales4";"Tipo de Movimiento";"Saldo"
+"02/09/2025";"Lorem Ipsum";"";"1000,00";"0";"";"Concepto X";"";"Nota lorem";"ABC123";"Leyenda lorem";"";"";"";"Imputado";"5000,00"
+'''
+
+NACION_CSV = '''Fecha,Comprobante,Concepto,Importe,Saldo
+01/10/2025,12345,PAGO VEP IPSUM,"$ -1.000,50","$ 2.000,75"
+'''
+
+SUPERVIELLE_CSV = '''Fecha,Concepto,Detalle,Débito,Crédito,Saldo
+2025/10/02 10:26,Lorem Transferencia,Detalle lorem,"0,00","500,00","1.000,00"
+'''
+
+CIUDAD_CSV = '''Cuenta;CUIT Cuenta;Fecha;Monto;N° de Comprobante;Descripción;Saldo;Observaciones
+CC $ 1234567890;20123456789;01/10/2025;-1234,56;67890;SUELDO IPSUM;5000,00;Obs lorem
+'''
+
+# Ciudad solo con las columnas canónicas (Observaciones es una extra que el loader conserva al final)
+CIUDAD_CANONICO_CSV = '''Cuenta;CUIT Cuenta;Fecha;Monto;N° de Comprobante;Descripción;Saldo
+CC $ 1234567890;20123456789;01/10/2025;-1234,56;67890;SUELDO IPSUM;5000,00
+'''
+
+MUESTRAS_POR_BANCO = {
+    "galicia": GALICIA_CSV,
+    "nacion": NACION_CSV,
+    "supervielle": SUPERVIELLE_CSV,
+    "ciudad": CIUDAD_CANONICO_CSV,
+}
@@ -0,0 +1,33 @@
+import io
+from datetime import date
+
+import pytest
+
+from logic.modelos import Movimiento
+
+# La app corre sus widgets al importarse (sin runtime de Streamlit son no-ops)
+app = pytest.importorskip("app_streamlit")
+
+
+def test_formatear_df_ui_importes_vacios_o_sin_valores():
+    """Tabla filtrada vacía o columna de importes toda NaN -> texto vacío, sin romper."""
+    vacia = app.formatear_df_ui(app.construir_salida([], [], []))
+    assert vacia.empty
+
+    solo_banco = app.construir_salida([], [Movimiento(date(2025, 9, 1), 1234.5, "Pago", "Banco")], [])
+    formateada = app.formatear_df_ui(solo_banco)
+    assert formateada["importe_banco"].tolist() == ["1.234,50"]
+    assert formateada["importe_interno"].tolist() == [""]
+    assert formateada["fecha_banco"].tolist() == ["01/09/2025"]
+
+
+def test_leer_csv_seguro_acento_despues_de_la_muestra():
+    """Muestra inicial ASCII y un byte cp1252 más adelante -> reintenta con otro encoding."""
+    fila = "01/10/2025;PAGO;100\n"
+    relleno = fila * (app._BYTES_MUESTRA // len(fila) + 1)
+    archivo = io.BytesIO(("Fecha;Concepto;Importe\n" + relleno + "02/10/2025;PAGO CAFÉ;200\n").encode("cp1252"))
+    archivo.name = "interno.csv"
+
+    df = app.leer_csv_seguro(archivo)
+    assert list(df.columns) == ["Fecha", "Concepto", "Importe"]
+    assert df["Concepto"].iloc[-1] == "PAGO CAFÉ"
@@ -96,3 +96,40 @@ def test_casos_sin_match():
     matches, pend_b, pend_i = conciliar(banco, interno, Parametros())
     assert not matches
     assert len(pend_b) == 1 and len(pend_i) == 1
+
+
+def test_duplicado_sin_pareja_queda_pendiente():
+    """Dos movimientos idénticos en banco y uno solo en interno -> el segundo sigue pendiente."""
+    banco = [Movimiento(date(2023,12,29), 700, "PAGO 42", "Banco") for _ in range(2)]
+    interno = [Movimiento(date(2023,12,29), 700, "PAGO 42", "Interno")]
+
+    matches, pend_b, pend_i = conciliar(banco, interno, Parametros())
+    assert len(matches) == 1
+    assert len(pend_b) == 1 and not pend_i
+
+
+def test_texto_similar_concilia_variantes():
+    """Sin tokens en común pero con descripciones casi iguales (plural/género) -> nivel 'texto similar'
+    solo si se activa el umbral; por defecto sigue siendo una sugerencia."""
+    banco = [Movimiento(date(2023,12,30), 800, "HONORARIOS CONTADOR", "Banco")]
+    interno = [Movimiento(date(2023,12,30), 800, "HONORARIO CONTADORA", "Interno")]
+
+    matches, _, _ = conciliar(banco, interno, Parametros(umbral_similitud_texto=0.85))
+    assert matches[0].estado == "Conciliado (texto similar)"
+
+    matches, _, _ = conciliar(banco, interno, Parametros())
+    assert matches[0].estado.startswith("Sugerido")
+
+
+def test_sugerencias_en_paralelo_igual_que_en_serie(monkeypatch):
+    """Repartir las sugerencias entre procesos no cambia matches ni pendientes."""
+    import logic.conciliacion as conc
+
+    monkeypatch.setattr(conc, "_MIN_BANCO_PARALELO", 0)
+    banco = [Movimiento(date(2024,1,1 + k % 5), 100 + k % 7, f"PAGO {k}", "Banco") for k in range(30)]
+    interno = [Movimiento(date(2024,1,2 + k % 5), 100.5 + k % 7, f"REF {k}", "Interno") for k in range(20)]
+
+    serie = conciliar(banco, interno, Parametros(tolerancia_importe=1.0, tolerancia_dias=2))
+    paralelo = conciliar(banco, interno, Parametros(tolerancia_importe=1.0, tolerancia_dias=2, procesos=2))
+    assert paralelo == serie
+    assert serie[0]
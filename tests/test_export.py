@@ -0,0 +1,34 @@
+import io
+from datetime import date, datetime
+
+import openpyxl
+import pandas as pd
+
+from infra.export import dataframe_a_excel_bytes
+
+
+def test_exporta_fechas_con_formato():
+    df = pd.DataFrame({
+        "fecha_banco": pd.to_datetime([date(2025, 9, 1), pd.NaT]),
+        "importe_banco": [100.5, -20.0],
+        "desc_banco": ["Pago 1", "Pago 2"],
+    })
+    contenido = dataframe_a_excel_bytes(df, formato_columnas_fecha={"fecha_banco": "DD/MM/YYYY", "otra": "DD/MM/YYYY"})
+
+    ws = openpyxl.load_workbook(io.BytesIO(contenido)).active
+    assert [c.value for c in ws[1]] == ["fecha_banco", "importe_banco", "desc_banco"]
+    assert ws["A2"].value == datetime(2025, 9, 1)
+    assert ws["A2"].number_format == "DD/MM/YYYY"
+    assert ws["A3"].value is None
+    assert ws["B2"].value == 100.5
+
+
+def test_columna_de_texto_no_se_convierte_a_fecha():
+    """Una columna de texto con formato de fecha se exporta tal cual (sin parsear mes/día)."""
+    df = pd.DataFrame({"fecha_banco": ["01/02/2025", "sin fecha"]})
+    contenido = dataframe_a_excel_bytes(df, formato_columnas_fecha={"fecha_banco": "DD/MM/YYYY"})
+
+    ws = openpyxl.load_workbook(io.BytesIO(contenido)).active
+    assert ws["A2"].value == "01/02/2025"
+    assert ws["A3"].value == "sin fecha"
+    assert ws["A2"].number_format == "General"
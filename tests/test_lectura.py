@@ -1,6 +1,12 @@
 import pandas as pd
 
-from logic.lectura import detectar_modo, normalizar_columna_descripcion
+from logic.lectura import (
+    detectar_encabezado,
+    detectar_formato_fecha,
+    detectar_modo,
+    normalizar_columna_descripcion,
+    parsear_fechas,
+)
 
 
 def test_detectar_modo_dc():
@@ -14,6 +20,7 @@ def test_detectar_modo_dc():
     assert modo == "Débito/Crédito"
     assert d == "Débito"
     assert c == "Crédito"
+    assert detectar_modo(df).descripcion == "Detalle"
 
 
 def test_detectar_modo_dc_signo_pregunta():
@@ -33,3 +40,22 @@ def test_normalizar_columna_descripcion_numeros():
     serie = pd.Series([48923.0, 48924, "48925", None, float("nan"), 51234.50])
     normalizada = normalizar_columna_descripcion(serie)
     assert normalizada.tolist() == ["48923", "48924", "48925", "", "", "51234.5"]
+
+
+def test_parsear_fechas_detecta_formato_dia_primero():
+    serie = pd.Series(["01/09/2025", "02/09/2025", None, "basura"])
+    fechas = parsear_fechas(serie)
+    assert fechas.iloc[0] == pd.Timestamp(2025, 9, 1)
+    assert fechas.iloc[1] == pd.Timestamp(2025, 9, 2)
+    assert fechas.iloc[2:].isna().all()
+    assert detectar_formato_fecha(pd.Series(["2025-09-01"])) == "%Y-%m-%d"
+
+
+def test_detectar_encabezado_con_celdas_vacias():
+    df = pd.DataFrame([
+        ["Extracto de cuenta", None, None],
+        [None, None, None],
+        ["Fecha", "Descripción", "Importe"],
+        ["01/09/2025", "Pago", 100],
+    ])
+    assert detectar_encabezado(df) == 2
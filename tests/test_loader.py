@@ -1,71 +1,185 @@
 import io
+
+import pandas as pd
 import pytest
 
-from infra.loader_bancos import cargar_banco, BANCOS, _keyize
+import infra.loader_bancos as loader
+from infra.loader_bancos import (
+    _BYTES_MUESTRA,
+    _key_index,
+    _keyize,
+    _split_header,
+    cargar_banco,
+    col_for,
+    detectar_banco_tolerante,
+)
+from tests.muestras import CIUDAD_CSV, GALICIA_CSV, MUESTRAS_POR_BANCO, NACION_CSV, SUPERVIELLE_CSV
 
 
-def test_galicia_loader():
-    data = '''"Fecha";"Descripción";"Origen";"Débitos";"Créditos";"Grupo de Conceptos";"Concepto";"Número de Terminal";"Observaciones Cliente";"Número de Comprobante";"Leyendas Adicionales1";"Leyendas Adicionales2";"Leyendas Adicionales3";"Leyendas Adicionales4";"Tipo de Movimiento";"Saldo"
-"02/09/2025";"Lorem Ipsum";"";"1000,00";"0";"";"Concepto X";"";"Nota lorem";"ABC123";"Leyenda lorem";"";"";"";"Imputado";"5000,00"
-'''
-    df, banco = cargar_banco(io.StringIO(data))
+def test_galicia_loader(cargado):
+    df, banco = cargado(GALICIA_CSV)
     assert banco == "galicia"
     assert df["Fecha"].iloc[0].day == 2
     deb_col = next(col for col in df.columns if _keyize(col) == "debitos")
     assert df[deb_col].iloc[0] == 1000.00
-    desc_cols = [col for col in df.columns if _keyize(col) == "descripcion"]
+    assert col_for(df, "debitos") == deb_col
+    desc_cols = _key_index(df)["descripcion"]
     assert len(desc_cols) == 1
-    desc_value = str(df[desc_cols[0]].iloc[0])
+    desc_value = df[desc_cols[0]].iloc[0]
     assert "Lorem" in desc_value
     assert "ABC123" in desc_value
 
 
-def test_nacion_loader():
-    data = '''Fecha,Comprobante,Concepto,Importe,Saldo
-01/10/2025,12345,PAGO VEP IPSUM,"$ -1.000,50","$ 2.000,75"
-'''
-    df, banco = cargar_banco(io.StringIO(data))
+def test_nacion_loader(cargado):
+    df, banco = cargado(NACION_CSV)
     assert banco == "nacion"
     assert df["Fecha"].iloc[0].month == 10
     assert df["Importe"].iloc[0] == -1000.50
     assert "Descripción" not in df.columns  # Nación no trae descripción
 
 
-def test_supervielle_loader():
-    data = '''Fecha,Concepto,Detalle,Débito,Crédito,Saldo
-2025/10/02 10:26,Lorem Transferencia,Detalle lorem,"0,00","500,00","1.000,00"
-'''
-    df, banco = cargar_banco(io.StringIO(data))
+def test_supervielle_loader(cargado):
+    df, banco = cargado(SUPERVIELLE_CSV)
     assert banco == "supervielle"
     assert df["Fecha"].iloc[0].year == 2025
     cred_col = next(col for col in df.columns if _keyize(col) == "credito")
     assert df[cred_col].iloc[0] == 500.00
     # verificar que exista columna "descripcion"
-    desc_cols = [col for col in df.columns if _keyize(col) == "descripcion"]
+    desc_cols = _key_index(df)["descripcion"]
     assert len(desc_cols) == 1
-    desc_value = str(df[desc_cols[0]].iloc[0])
+    desc_value = df[desc_cols[0]].iloc[0]
     assert "Lorem" in desc_value
     assert "Detalle" in desc_value
 
 
-def test_ciudad_loader():
-    data = '''Cuenta;CUIT Cuenta;Fecha;Monto;N° de Comprobante;Descripción;Saldo;Observaciones
-CC $ 1234567890;20123456789;01/10/2025;-1234,56;67890;SUELDO IPSUM;5000,00;Obs lorem
-'''
-    df, banco = cargar_banco(io.StringIO(data))
+def test_relectura_supervielle_trae_los_tres_importes():
+    """El filtro de columnas de la relectura cruda empareja "Débito"/"Crédito" por clave normalizada."""
+    crudo = loader._read_csv(
+        io.StringIO(SUPERVIELLE_CSV), ",", ",", None, as_text=True, columns=loader._SUPERVIELLE_IMPORTES
+    )
+    assert [_keyize(c) for c in crudo.columns] == ["debito", "credito", "saldo"]
+    assert crudo.iloc[0].tolist() == ["0,00", "500,00", "1.000,00"]
+
+
+def test_ciudad_loader(cargado):
+    df, banco = cargado(CIUDAD_CSV)
     assert banco == "ciudad"
     assert df["Fecha"].iloc[0].month == 10
     assert str(df["Fecha"].dtype).startswith("datetime64")
     assert df["Monto"].iloc[0] == -1234.56
-    desc_cols = [col for col in df.columns if _keyize(col) == "descripcion"]
+    desc_cols = _key_index(df)["descripcion"]
     assert len(desc_cols) == 1
-    desc_ciudad = str(df[desc_cols[0]].iloc[0])
+    desc_ciudad = df[desc_cols[0]].iloc[0]
     assert "67890" in desc_ciudad
     assert "SUELDO" in desc_ciudad
     assert "Obs lorem" in desc_ciudad
 
 
-def test_columns_are_canonical(request):
+def test_cabecera_con_separador_entre_comillas():
+    """Un separador dentro de un campo entrecomillado no parte la columna."""
+    assert _split_header('"Fecha";"Desc; extra";"Origen"') == ["Fecha", "Desc; extra", "Origen"]
+    data = "\n\nFecha,Comprobante,Concepto,Importe,Saldo\n01/10/2025,1,\"A, B\",\"$ 1,00\",\"$ 2,00\"\n"
+    assert detectar_banco_tolerante(io.StringIO(data)) == "nacion"
+
+
+def test_encoding_con_acento_despues_de_la_muestra():
+    """cp1252 puro ASCII en el prefijo y un acento más adelante -> reintenta con otro encoding."""
+    fila = '01/10/2025,1,PAGO,"$ 1,00","$ 2,00"\n'
+    relleno = fila * (_BYTES_MUESTRA // len(fila) + 1)
+    data = (NACION_CSV + relleno + '02/10/2025,2,PAGO CAFÉ,"$ 3,00","$ 4,00"\n').encode("cp1252")
+    df, banco = cargar_banco(io.BytesIO(data))
+    assert banco == "nacion"
+    assert df["Concepto"].iloc[-1] == "PAGO CAFÉ"
+    assert df["Importe"].iloc[-1] == 3.0
+
+
+def test_encoding_reintenta_si_no_parsea(monkeypatch):
+    """Un ParserError con el encoding detectado también pasa al siguiente candidato."""
+    leer = loader._read_csv
+    probados = []
+
+    def _read_csv(file_obj, sep, decimal, encoding, *args, **kwargs):
+        probados.append(encoding)
+        if encoding == "utf-8-sig":
+            raise pd.errors.ParserError("falla simulada")
+        return leer(file_obj, sep, decimal, encoding, *args, **kwargs)
+
+    monkeypatch.setattr(loader, "_read_csv", _read_csv)
+    df, banco = cargar_banco(io.BytesIO(NACION_CSV.encode("utf-8")))
+    assert banco == "nacion"
+    assert probados[:2] == ["utf-8-sig", "cp1252"]
+    assert len(df) == 1
+
+
+@pytest.mark.parametrize("data", [NACION_CSV, SUPERVIELLE_CSV, CIUDAD_CSV], ids=["nacion", "supervielle", "ciudad"])
+def test_lectura_por_partes_igual_a_lectura_unica(data, tmp_path, monkeypatch):
+    """Archivo en disco leído en partes de 2 filas -> mismo resultado (y mismas categorías) que de una vez."""
+    encabezado, fila = data.splitlines()
+    otra = fila.replace("2025", "2024", 1)
+    path = tmp_path / "extracto.csv"
+    path.write_text("\n".join([encabezado, fila, otra, fila, otra, otra]) + "\n", encoding="utf-8")
+
+    unica, banco = cargar_banco(str(path))
+    monkeypatch.setattr(loader, "_BYTES_LECTURA_POR_PARTES", 0)
+    monkeypatch.setattr(loader, "_FILAS_POR_PARTE", 2)
+    por_partes, _ = cargar_banco(str(path))
+
+    pd.testing.assert_frame_equal(por_partes, unica)
+    for col in loader.BANCOS[banco]["categoricas"]:
+        assert por_partes[col].cat.categories.equals(unica[col].cat.categories)
+
+
+def _leer_con_lector(monkeypatch, data, lector, nombre):
+    """cargar_banco con el lector opcional `nombre` envuelto: registra sus lecturas y sus fallos, que
+    cargar_banco taparía cayendo al motor C (o al autodetectar separador si sale una sola columna)."""
+    llamadas, fallos = [], []
+
+    def envuelto(*args, **kwargs):
+        try:
+            leido = lector(*args, **kwargs)
+        except Exception as exc:
+            fallos.append(exc)
+            raise
+        llamadas.append(leido)
+        return leido
+
+    monkeypatch.setattr(loader, nombre, envuelto)
+    df, banco = cargar_banco(io.StringIO(data))
+    assert not fallos
+    assert all(leido.shape[1] > 1 for leido in llamadas)
+    return df, llamadas
+
+
+_MUESTRAS_LECTORES = pytest.mark.parametrize(
+    "banco, data",
+    [*MUESTRAS_POR_BANCO.items(), ("ciudad", CIUDAD_CSV)],
+    ids=[*MUESTRAS_POR_BANCO, "ciudad-observaciones"],
+)
+
+
+@_MUESTRAS_LECTORES
+def test_lector_polars_igual_a_pandas(banco, data, monkeypatch):
+    pytest.importorskip("polars")
+    esperado, _ = cargar_banco(io.StringIO(data))
+
+    monkeypatch.setattr(loader, "_USE_POLARS", True)
+    df, llamadas = _leer_con_lector(monkeypatch, data, loader._read_csv_polars, "_read_csv_polars")
+    assert llamadas or banco == "galicia"  # Galicia tiene su propia lectura
+    pd.testing.assert_frame_equal(df, esperado)
+
+
+@_MUESTRAS_LECTORES
+def test_lector_pyarrow_igual_a_motor_c(banco, data, monkeypatch):
+    pytest.importorskip("pyarrow")
+    esperado, _ = cargar_banco(io.StringIO(data))
+
+    monkeypatch.setattr(loader, "_CSV_ENGINE", "pyarrow")
+    df, llamadas = _leer_con_lector(monkeypatch, data, loader._read_csv_arrow, "_read_csv_arrow")
+    assert llamadas or banco in ("galicia", "supervielle")  # lecturas propias / solo texto
+    pd.testing.assert_frame_equal(df, esperado)
+
+
+def test_columns_are_canonical(request, canonical_keys):
     """Verifica que las columnas devueltas sean las canónicas para cada banco."""
     try:
         sample_files_by_bank = request.getfixturevalue("sample_files_by_bank")
@@ -76,7 +190,6 @@ def test_columns_are_canonical(request):
         df, detected = cargar_banco(csv_path)
         assert detected == banco
         # comparación usando _keyize para tolerancia
-        exp_keys = [_keyize(c) for c in BANCOS[banco]["cols"]]
-        got_keys = [_keyize(c) for c in df.columns]
-        assert exp_keys == got_keys
+        got_keys = tuple(_keyize(c) for c in df.columns)
+        assert canonical_keys[banco] == got_keys
 